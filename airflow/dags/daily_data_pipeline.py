@@ -1,13 +1,20 @@
 from datetime import datetime, timedelta
 import os
-import json
-import glob
-from typing import List, Dict
+import re
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Iterator, Optional, Tuple
 
 from airflow import DAG
 from airflow.operators.python import PythonOperator
 import boto3
+from boto3.s3.transfer import TransferConfig, create_transfer_manager
+from botocore.config import Config
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # DAG 기본 설정
 default_args = {
@@ -26,6 +33,7 @@ dag = DAG(
     description='한국인 영어 말하기 평가 수준별 데이터 레이크 구축',
     schedule_interval='@daily',
     catchup=True,
+    max_active_runs=1,  # 참가자 매니페스트 갱신(read-modify-write) 충돌 방지
     tags=['s3', 'upload', 'metadata']
 )
 
@@ -39,44 +47,178 @@ def is_valid_yyyymmdd(date_str: str) -> bool:
         return False
 
 
-def find_files_by_date(target_date: str) -> List[Dict]:
+# 날짜 스캔 시 동시에 읽을 파일 수
+SCAN_MAX_WORKERS = 16
+# S3 동시 전송 수 (태스크 전체에서 파일 업로드와 멀티파트 파트 전송이 공유)
+UPLOAD_MAX_WORKERS = 32
+# S3 커넥션 풀 크기 (동시 전송 수와 동일하게 맞춤)
+S3_MAX_POOL_CONNECTIONS = UPLOAD_MAX_WORKERS
+
+# 업로드 발생 시 갱신하는 마커 (API 서버의 로컬 캐시 무효화용, api_server.py의 S3_DATA_MARKER_KEY와 같은 키)
+S3_DATA_MARKER_KEY = "raw/_last_modified"
+# 참가자별 JSON 키 매니페스트 (API 서버가 raw/ 전체 LIST 대신 사용)
+S3_MANIFEST_KEY = "_manifests/participants.parquet"
+
+# S3 클라이언트 공통 설정 (재시도 + keep-alive)
+S3_CLIENT_CONFIG = Config(
+    max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+    tcp_keepalive=True,
+    retries={'max_attempts': 5, 'mode': 'adaptive'}
+)
+
+MB = 1024 * 1024
+# 대용량 파일은 8MB 단위 멀티파트로 전송 (태스크당 하나의 TransferManager에서 사용)
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * MB,
+    multipart_chunksize=8 * MB,
+    max_concurrency=UPLOAD_MAX_WORKERS,
+    use_threads=True
+)
+
+# 분석 API 주소 및 커넥션 풀/재시도 설정
+ANALYSIS_API_URL = "http://api:8000"
+API_POOL_SIZE = 10
+# 요청 전송 전 연결 실패만 재시도 (POST는 urllib3 기본 allowed_methods에 없어 상태 코드/읽기 오류는 재시도하지 않음,
+# /refresh 등은 멱등성이 보장되지 않으므로 중복 실행 방지)
+API_RETRY = Retry(total=3, backoff_factor=0.5)
+
+
+def _probe_file(candidate: Tuple[str, str, str], target_date: str, date_pattern: re.Pattern) -> Optional[Dict]:
     """
-    특정 날짜(YYYYMMDD)의 JSON 파일 목록 반환
+    단일 JSON 파일의 metadata.date를 확인하여 일치하면 파일 정보 반환
     """
-    dataset_path = "/opt/airflow/dataset"
-    matching_files = []
+    json_file, level, participant_dir = candidate
+    try:
+        with open(json_file, 'rb') as f:
+            raw = f.read()
+        # 대상 날짜 문자열이 없으면 전체 파싱 생략
+        if not date_pattern.search(raw):
+            return None
+        data = orjson.loads(raw)
+        file_date = data.get('metadata', {}).get('date')
+        if file_date and file_date == target_date and is_valid_yyyymmdd(file_date):
+            return {
+                'file_path': json_file,
+                'level': level,
+                'participant': participant_dir,
+                'date': file_date
+            }
+    except Exception as e:
+        print(f"파일 읽기 오류 {json_file}: {e}")
+    return None
 
+
+def _iter_dataset_files(dataset_path: str) -> Iterator[Tuple[str, str, str]]:
+    """
+    <dataset>/<레벨>/<참가자 디렉토리>/*.json 파일을 (파일 경로, 레벨, 참가자 디렉토리)로 순회
+    os.scandir의 캐시된 엔트리 타입을 사용하여 디렉토리별 추가 stat 호출 회피
+    """
     for level in ['IG', 'NA', 'TH', 'TL', 'TM']:
         level_path = f"{dataset_path}/{level}"
-        if not os.path.exists(level_path):
+        if not os.path.isdir(level_path):
             continue
 
-        for participant_dir in os.listdir(level_path):
-            participant_path = f"{level_path}/{participant_dir}"
-            if not os.path.isdir(participant_path):
-                continue
-
-            json_files = glob.glob(f"{participant_path}/*.json")
-            for json_file in json_files:
-                try:
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        file_date = data.get('metadata', {}).get('date')
-                        if file_date and file_date == target_date and is_valid_yyyymmdd(file_date):
-                            matching_files.append({
-                                'file_path': json_file,
-                                'level': level,
-                                'participant': participant_dir,
-                                'date': file_date
-                            })
-                except Exception as e:
-                    print(f"파일 읽기 오류 {json_file}: {e}")
+        with os.scandir(level_path) as participant_entries:
+            for participant_entry in participant_entries:
+                if not participant_entry.is_dir():
+                    continue
+                with os.scandir(participant_entry.path) as file_entries:
+                    for file_entry in file_entries:
+                        # glob('*.json')과 동일하게 숨김 파일은 제외
+                        if file_entry.name.endswith('.json') and not file_entry.name.startswith('.'):
+                            yield file_entry.path, level, participant_entry.name
+
+
+def find_files_by_date(target_date: str) -> List[Dict]:
+    """
+    특정 날짜(YYYYMMDD)의 JSON 파일 목록 반환
+    """
+    dataset_path = "/opt/airflow/dataset"
+
+    # "date": "YYYYMMDD" 바이트 패턴으로 사전 필터링
+    date_pattern = re.compile(rb'"date"\s*:\s*"' + re.escape(target_date.encode()) + rb'"')
+
+    # 파일 I/O를 겹쳐서 처리 (결과 순서는 후보 순서 유지)
+    with ThreadPoolExecutor(max_workers=SCAN_MAX_WORKERS) as executor:
+        candidates = _iter_dataset_files(dataset_path)
+        results = executor.map(lambda c: _probe_file(c, target_date, date_pattern), candidates)
+        matching_files = [r for r in results if r is not None]
 
     print(f"날짜 {target_date}에 해당하는 파일 {len(matching_files)}개 발견")
     print(f"응답자: {[f['participant'] for f in matching_files]}")
     return matching_files
 
 
+@lru_cache(maxsize=None)
+def get_s3_client():
+    """
+    태스크 프로세스 내에서 공유하는 S3 클라이언트
+    DAG 파싱 시에는 생성하지 않도록 첫 호출 시 지연 생성
+    """
+    session = boto3.session.Session(
+        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
+        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+        region_name=os.getenv('AWS_REGION', 'ap-northeast-2')
+    )
+    return session.client('s3', config=S3_CLIENT_CONFIG)
+
+
+@lru_cache(maxsize=None)
+def get_api_session() -> requests.Session:
+    """분석 API 호출용 keep-alive 세션 (S3 클라이언트와 같이 첫 호출 시 생성)"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=API_POOL_SIZE, pool_maxsize=API_POOL_SIZE, max_retries=API_RETRY)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def _participant_id(s3_key: str) -> Optional[str]:
+    """raw/year=/month=/day=/level=/<참가자 디렉토리>/... 키에서 참가자 ID 추출"""
+    parts = s3_key.split('/')
+    if not s3_key.endswith('.json') or len(parts) < 6:
+        return None
+    return parts[5].replace('_json', '')
+
+
+def update_participant_manifest(s3_client, bucket_name: str, new_keys: List[str]) -> bool:
+    """
+    키 목록을 참가자 매니페스트(pid, key)에 병합 (매니페스트가 없으면 raw/ 전체 목록으로 생성)
+    참가자별 모든 키를 보관하여 API 서버가 prefix 필터 후 사전순 첫 키를 고를 수 있게 함
+    매니페스트에 새 키가 추가되었으면 True 반환
+    """
+    import pandas as pd  # DAG 파싱 비용을 줄이기 위해 태스크 실행 시점에 import
+
+    try:
+        obj = s3_client.get_object(Bucket=bucket_name, Key=S3_MANIFEST_KEY)
+        keys = pd.read_parquet(BytesIO(obj['Body'].read()), columns=['key'])['key'].tolist()
+    except s3_client.exceptions.NoSuchKey:
+        print("참가자 매니페스트가 없어 raw/ 전체 목록으로 생성")
+        keys = []
+        paginator = s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=bucket_name, Prefix="raw/"):
+            keys.extend(item['Key'] for item in page.get('Contents', []))
+        previous_count = -1
+    else:
+        previous_count = len(keys)
+
+    rows = []
+    for key in set(keys) | set(new_keys):
+        pid = _participant_id(key)
+        if pid:
+            rows.append((pid, key))
+    manifest = pd.DataFrame(rows, columns=['pid', 'key']).sort_values('key', ignore_index=True)
+    if len(manifest) == previous_count:
+        print("참가자 매니페스트 변경 없음")
+        return False
+
+    buffer = BytesIO()
+    manifest.to_parquet(buffer, index=False)
+    s3_client.put_object(Bucket=bucket_name, Key=S3_MANIFEST_KEY, Body=buffer.getvalue())
+    print(f"참가자 매니페스트 갱신 완료: {manifest['pid'].nunique()}명, {len(manifest)}개 파일")
+    return True
+
+
 def upload_to_s3(**context):
     """
     실행 날짜의 JSON 파일을 S3에 업로드
@@ -91,17 +233,21 @@ def upload_to_s3(**context):
         print("업로드할 파일이 없습니다.")
         return {"uploaded_files": 0}
 
-    # S3 클라이언트
-    s3_client = boto3.client(
-        's3',
-        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-        region_name=os.getenv('AWS_REGION', 'ap-northeast-2')
-    )
+    s3_client = get_s3_client()
 
     bucket_name = os.getenv('S3_BUCKET_NAME')
-    uploaded_count = 0
 
+    # 중복 업로드 회피: 해당 날짜 prefix의 기존 키를 한 번에 조회
+    year, month, day = current_date[:4], current_date[4:6], current_date[6:8]
+    existing_keys = set()
+    try:
+        paginator = s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=bucket_name, Prefix=f"raw/year={year}/month={month}/day={day}/"):
+            existing_keys.update(obj['Key'] for obj in page.get('Contents', []))
+    except s3_client.exceptions.ClientError as e:
+        print(f"기존 파일 목록 조회 실패, 전체 업로드 진행: {e}")
+
+    pending_uploads = []
     for file_info in matching_files:
         file_date = file_info['date']
         if not is_valid_yyyymmdd(file_date):
@@ -112,20 +258,44 @@ def upload_to_s3(**context):
         file_name = os.path.basename(file_info['file_path'])
         s3_key = f"raw/year={year}/month={month}/day={day}/level={file_info['level']}/{file_info['participant']}/{file_name}"
 
-        # 중복 업로드 회피 (S3 존재 확인)
-        try:
-            s3_client.head_object(Bucket=bucket_name, Key=s3_key)
+        if s3_key in existing_keys:
             print(f"S3에 이미 존재, 스킵: {s3_key}")
             continue
-        except s3_client.exceptions.ClientError:
-            pass  # 존재하지 않으면 업로드 진행
+        pending_uploads.append((file_info['file_path'], s3_key))
 
+    # 하나의 TransferManager에 모든 업로드를 제출하여 전송 스레드 수를 UPLOAD_MAX_WORKERS로 제한
+    uploaded_keys = []
+    with create_transfer_manager(s3_client, S3_TRANSFER_CONFIG) as manager:
+        futures = [
+            (file_path, s3_key, manager.upload(file_path, bucket_name, s3_key))
+            for file_path, s3_key in pending_uploads
+        ]
+        for file_path, s3_key, future in futures:
+            try:
+                future.result()
+                print(f"업로드 완료: {s3_key}")
+                uploaded_keys.append(s3_key)
+            except Exception as e:
+                print(f"업로드 실패 {file_path}: {e}")
+    uploaded_count = len(uploaded_keys)
+
+    # 새 데이터가 있음을 API 서버에 알리는 매니페스트 및 마커 갱신
+    # 이전 실행에서 업로드 후 매니페스트 병합이 실패했을 수 있으므로 이미 있던 키까지 매번 병합
+    date_keys = existing_keys.union(uploaded_keys)
+    manifest_changed = False
+    if date_keys:
+        try:
+            manifest_changed = update_participant_manifest(s3_client, bucket_name, sorted(date_keys))
+        except Exception as e:
+            # 오래된 매니페스트가 남지 않도록 삭제 (API는 LIST로 폴백, 다음 실행에서 재생성)
+            print(f"참가자 매니페스트 갱신 실패, 매니페스트 삭제: {e}")
+            s3_client.delete_object(Bucket=bucket_name, Key=S3_MANIFEST_KEY)
+            manifest_changed = True
+    if uploaded_count > 0 or manifest_changed:
         try:
-            s3_client.upload_file(file_info['file_path'], bucket_name, s3_key)
-            uploaded_count += 1
-            print(f"업로드 완료: {s3_key}")
+            s3_client.put_object(Bucket=bucket_name, Key=S3_DATA_MARKER_KEY, Body=current_date.encode())
         except Exception as e:
-            print(f"업로드 실패 {file_info['file_path']}: {e}")
+            print(f"데이터 마커 갱신 실패: {e}")
 
     print(f"총 {uploaded_count}개 파일 업로드 완료")
     return {"uploaded_files": uploaded_count}
@@ -146,8 +316,9 @@ def call_analysis_api(**context):
     if upload_result and upload_result['uploaded_files'] > 0:
         try:
             # 1. 기존 분석 API 호출
-            response = requests.post(
-                'http://api:8000/analyze/new-data',
+            session = get_api_session()
+            response = session.post(
+                f'{ANALYSIS_API_URL}/analyze/new-data',
                 json={
                     "file_count": upload_result['uploaded_files'],
                     "message": f"{upload_result['uploaded_files']}개 파일이 S3에 업로드됨"
@@ -158,8 +329,8 @@ def call_analysis_api(**context):
             print(f"분석 API 호출 성공: {response.json()}")
             
             # 2. ELT 변환 트리거 (/refresh API 호출)
-            refresh_response = requests.post(
-                'http://api:8000/refresh',
+            refresh_response = session.post(
+                f'{ANALYSIS_API_URL}/refresh',
                 json={
                     "trigger": "airflow_daily",
                     "uploaded_files": upload_result['uploaded_files'],
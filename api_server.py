@@ -4,19 +4,25 @@ FastAPI 백엔드 - 데이터 분석 API 서버
 da2.ipynb의 분석 로직을 API 엔드포인트로 제공
 """
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import pandas as pd
 import numpy as np
-from scipy.stats import pearsonr, spearmanr, ttest_ind, f_oneway, mannwhitneyu, chi2_contingency
+import pyarrow as pa
+from scipy.stats import mannwhitneyu, chi2_contingency, t as t_dist, f as f_dist
 import os
-import json
+import orjson
 import boto3
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from botocore.exceptions import NoCredentialsError, PartialCredentialsError, ClientError
 import logging
+import asyncio
+from io import BytesIO
+import threading
 from datetime import datetime
 
 # 환경변수 로드
@@ -43,15 +49,42 @@ app.add_middleware(
 
 # 전역 변수로 데이터 캐싱
 df_master: Optional[pd.DataFrame] = None
+# df_master의 가설 검정용 집계 큐브
+df_cube: Optional[pd.DataFrame] = None
+# df_master의 데이터 버전 (클라이언트 캐시 키, 같은 캐시 파일에서 로드하면 서버 재시작 후에도 유지)
+df_version: Optional[str] = None
+# df_master 컬럼별 정렬된 고유값 (지역/레벨 필터 목록, df_master와 함께 교체)
+df_filter_values: Dict[str, Tuple[str, ...]] = {}
+# 동시 요청 시 S3 적재가 중복 실행되지 않도록 보호
+_df_master_lock = threading.Lock()
 
 # S3 설정 (환경변수)
 AWS_REGION = os.getenv("AWS_REGION") or os.getenv("AWS_DEFAULT_REGION") or "ap-northeast-2"
 S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME")
 S3_RAW_PREFIX = os.getenv("S3_RAW_PREFIX", "")
 
-# S3 클라이언트 초기화
+# 참가자 파일 동시 다운로드 수
+S3_LOAD_MAX_WORKERS = 64
+
+# 전처리된 df_master 로컬 캐시 (재시작 시 S3 재적재 생략)
+DF_CACHE_PATH = os.getenv("DF_CACHE_PATH", "/tmp/df_master.parquet")
+# Airflow 업로드 태스크가 관리하는 참가자별 JSON 키 매니페스트 (pid, key)
+S3_MANIFEST_KEY = "_manifests/participants.parquet"
+# Airflow 업로드 태스크가 갱신하는 마커, 캐시보다 최신이면 캐시 무효화
+# (DAG의 S3_DATA_MARKER_KEY와 같은 키, DAG는 항상 raw/ 아래에 업로드)
+S3_DATA_MARKER_KEY = "raw/_last_modified"
+
+# S3 클라이언트 초기화 (병렬 다운로드 수만큼 커넥션 풀 확보, 재시도 + keep-alive)
 try:
-    s3_client = boto3.client("s3", region_name=AWS_REGION)
+    s3_session = boto3.session.Session(region_name=AWS_REGION)
+    s3_client = s3_session.client(
+        "s3",
+        config=Config(
+            max_pool_connections=S3_LOAD_MAX_WORKERS,
+            tcp_keepalive=True,
+            retries={'max_attempts': 5, 'mode': 'adaptive'}
+        )
+    )
 except Exception as e:
     logger.warning(f"S3 클라이언트 초기화 실패: {e}")
     s3_client = None
@@ -82,11 +115,35 @@ class FilterRequest(BaseModel):
     levels: Optional[List[str]] = None
 
 # 분석 함수들
-def calculate_effect_size(group1: np.ndarray, group2: np.ndarray) -> float:
-    """Cohen's d 효과 크기 계산"""
-    n1, n2 = len(group1), len(group2)
-    pooled_std = np.sqrt(((n1-1)*group1.var() + (n2-1)*group2.var()) / (n1+n2-2))
-    return (group1.mean() - group2.mean()) / pooled_std
+def calculate_effect_size(n1: int, mean1: float, var1: float, n2: int, mean2: float, var2: float) -> float:
+    """Cohen's d 효과 크기 계산 (그룹별 표본 수, 평균, 표본분산 기반)"""
+    pooled_std = np.sqrt(((n1-1)*var1 + (n2-1)*var2) / (n1+n2-2))
+    return float((mean1 - mean2) / pooled_std)
+
+def student_ttest(n1: int, mean1: float, var1: float, n2: int, mean2: float, var2: float) -> Tuple[float, float]:
+    """등분산 독립표본 t-검정 (scipy.stats.ttest_ind 기본 설정과 동일)"""
+    dof = n1 + n2 - 2
+    pooled_var = ((n1-1)*var1 + (n2-1)*var2) / dof
+    t_stat = (mean1 - mean2) / np.sqrt(pooled_var * (1/n1 + 1/n2))
+    return float(t_stat), float(2 * t_dist.sf(abs(t_stat), dof))
+
+def weighted_pearsonr(x: np.ndarray, y: np.ndarray, w: np.ndarray) -> Tuple[float, float]:
+    """빈도 가중 피어슨 상관계수와 양측 p-value (scipy.stats.pearsonr와 동일한 검정)"""
+    n = w.sum()
+    dx = x - np.average(x, weights=w)
+    dy = y - np.average(y, weights=w)
+    r = float(np.clip(np.sum(w*dx*dy) / np.sqrt(np.sum(w*dx*dx) * np.sum(w*dy*dy)), -1.0, 1.0))
+    if abs(r) == 1.0:
+        return r, 0.0
+    t_stat = r * np.sqrt((n - 2) / (1 - r*r))
+    return r, float(2 * t_dist.sf(abs(t_stat), n - 2))
+
+def weighted_rank(values: np.ndarray, w: np.ndarray) -> np.ndarray:
+    """빈도 가중 평균 순위 (동점은 평균 순위, rank(method='average')와 동일)"""
+    _, inverse = np.unique(values, return_inverse=True)
+    counts = np.bincount(inverse, weights=w)
+    avg_ranks = np.cumsum(counts) - (counts - 1) / 2
+    return avg_ranks[inverse]
 
 def interpret_effect_size(d: float) -> str:
     """효과 크기 해석"""
@@ -111,31 +168,29 @@ LEVEL_MAPPING = {
     'NA': 5   # Native-like
 }
 
-def create_age_groups(age: int) -> str:
-    if pd.isna(age):
-        return "미상"
-    age_int = int(age)
-    if age_int < 25:
-        return '20대 초반'
-    elif age_int < 30:
-        return '20대 후반'
-    elif age_int < 35:
-        return '30대 초반'
-    elif age_int < 40:
-        return '30대 후반'
-    else:
-        return '40대 이상'
-
-def classify_metropolitan(location: str) -> bool:
-    if not isinstance(location, str):
-        return False
-    metro_areas = ['서울', '경기']
-    return any(area in location for area in metro_areas)
+# 연령대 구간 경계 (각 경계값은 다음 구간에 포함) 및 라벨
+AGE_BOUNDARIES = np.array([25, 30, 35, 40])
+AGE_LABELS = ['20대 초반', '20대 후반', '30대 초반', '30대 후반', '40대 이상']
+
+# 수도권 판별 패턴
+METRO_PATTERN = '서울|경기'
+
+# 메모리 절감 및 groupby 가속을 위한 컬럼 dtype
+COMPACT_DTYPES = {
+    'english_level': 'category',
+    'location': 'category',
+    'gender': 'category',
+    'age_group': 'category',
+    'self_grade': 'category',
+    'age': 'int16',
+    'english_level_numeric': 'int8'
+}
 
-def extract_english_experience(interview_data: Dict) -> bool:
-    if not isinstance(interview_data, dict):
-        return False
-    return interview_data.get('영어권_거주_여부', '') == '있음'
+# 추출 결과 컬럼 (추출된 문서가 없어도 같은 스키마 유지)
+ANALYSIS_FIELDS = [
+    'participant_id', 'age', 'gender', 'location', 'english_level', 'self_grade',
+    'combo_scores', 'interview', 'file_date', 'year'
+]
 
 def extract_analysis_data(data: Dict) -> Optional[Dict]:
     """단일 JSON에서 분석 필드 추출"""
@@ -164,13 +219,40 @@ def extract_analysis_data(data: Dict) -> Optional[Dict]:
         logger.warning(f"데이터 추출 실패: {e}")
         return None
 
+def extract_analysis_frame(datas: List[Dict]) -> pd.DataFrame:
+    """JSON 문서들에서 유효한 분석 필드만 추출하여 DataFrame 생성"""
+    records = [record for record in map(extract_analysis_data, datas) if record]
+    return pd.DataFrame.from_records(records, columns=ANALYSIS_FIELDS)
+
+def load_participant_manifest(bucket_name: str, prefix: str = "") -> Optional[Dict[str, str]]:
+    """S3 매니페스트에서 참가자별 대표 파일 로드 (없으면 None)
+    LIST 순회와 같은 결과가 되도록 prefix로 먼저 거른 뒤 참가자별 사전순 첫 키 선택"""
+    try:
+        obj = s3_client.get_object(Bucket=bucket_name, Key=S3_MANIFEST_KEY)
+        manifest = pd.read_parquet(BytesIO(obj['Body'].read()), columns=['pid', 'key'])
+    except ClientError:
+        return None
+    except Exception as e:
+        logger.warning(f"참가자 매니페스트 로드 실패: {e}")
+        return None
+    if prefix:
+        manifest = manifest[manifest['key'].str.startswith(prefix)]
+    manifest = manifest.sort_values('key').drop_duplicates('pid', keep='first')
+    return dict(zip(manifest['pid'], manifest['key']))
+
 def get_participant_representative_files(bucket_name: str, prefix: str = "") -> Dict[str, str]:
     """참가자별 대표 JSON 파일 하나 선택 (비용 절감)"""
     if s3_client is None:
         raise HTTPException(status_code=500, detail="S3 클라이언트가 초기화되지 않았습니다.")
+    # 매니페스트가 있으면 LIST 순회 없이 GET 한 번으로 대체
+    representative = load_participant_manifest(bucket_name, prefix)
+    if representative:
+        logger.info(f"S3 매니페스트에서 대표 파일 로드 - 참가자 {len(representative)}명")
+        return representative
     paginator = s3_client.get_paginator('list_objects_v2')
-    pages = paginator.paginate(Bucket=bucket_name, Prefix=prefix)
-    participant_files: Dict[str, List[str]] = {}
+    pages = paginator.paginate(Bucket=bucket_name, Prefix=prefix, PaginationConfig={'PageSize': 1000})
+    # 참가자별 처음 발견된 키만 보관
+    representative: Dict[str, str] = {}
     for page in pages:
         for obj in page.get('Contents', []):
             key = obj['Key']
@@ -182,17 +264,16 @@ def get_participant_representative_files(bucket_name: str, prefix: str = "") ->
             if len(parts) >= 6:
                 participant_dir = parts[5]
                 participant_id = participant_dir.replace('_json', '')
-                participant_files.setdefault(participant_id, []).append(key)
-    # 각 참가자 첫 파일 선택
-    representative: Dict[str, str] = {pid: files[0] for pid, files in participant_files.items() if files}
+                if participant_id in representative:
+                    continue
+                representative[participant_id] = key
     logger.info(f"S3 대표 파일 수집 완료 - 참가자 {len(representative)}명")
     return representative
 
 def load_participant_data(bucket_name: str, file_key: str) -> Optional[Dict]:
     try:
         obj = s3_client.get_object(Bucket=bucket_name, Key=file_key)
-        content = obj['Body'].read().decode('utf-8')
-        return json.loads(content)
+        return orjson.loads(obj['Body'].read())
     except Exception as e:
         logger.warning(f"파일 로드 실패 {file_key}: {e}")
         return None
@@ -203,13 +284,20 @@ def preprocess_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     # 타입/파생 컬럼
     df['age'] = pd.to_numeric(df['age'], errors='coerce')
     df['english_level_numeric'] = df['english_level'].map(LEVEL_MAPPING)
-    df['age_group'] = df['age'].apply(create_age_groups)
-    df['is_metropolitan'] = df['location'].apply(classify_metropolitan)
-    df['english_speaking_experience'] = df['interview'].apply(extract_english_experience)
+    # 연령대: 경계 배열 이진 탐색으로 범주 코드 산출 (나이 결측은 -1 -> NaN, 이후 제거)
+    age_codes = np.searchsorted(AGE_BOUNDARIES, df['age'].to_numpy(), side='right')
+    age_codes[df['age'].isna().to_numpy()] = -1
+    df['age_group'] = pd.Categorical.from_codes(age_codes, categories=AGE_LABELS)
+    # 수도권: 고유 지역명에만 패턴 검사 후 범주 코드로 전개 (코드 -1 = 결측 -> 마지막 False)
+    location = df['location'].astype('category')
+    metro_by_code = location.cat.categories.astype(str).str.contains(METRO_PATTERN, regex=True)
+    df['is_metropolitan'] = np.append(metro_by_code, False)[location.cat.codes.to_numpy()]
+    df['english_speaking_experience'] = df['interview'].str.get('영어권_거주_여부').eq('있음')
     # 핵심 결측 제거
     before = len(df)
     df = df.dropna(subset=['age', 'english_level_numeric', 'location'])
     after = len(df)
+    df = df.astype(COMPACT_DTYPES)
     logger.info(f"전처리 완료: {before} -> {after} (제거 {before-after})")
     return df
 
@@ -228,51 +316,307 @@ def load_all_participant_data() -> pd.DataFrame:
         logger.warning(f"버킷 접근 확인 경고: {e}")
 
     rep_files = get_participant_representative_files(S3_BUCKET_NAME, S3_RAW_PREFIX)
-    all_rows: List[Dict] = []
-    failed = 0
-    for i, (pid, key) in enumerate(rep_files.items(), start=1):
-        if i % 200 == 0:
-            logger.info(f"진행률: {i}/{len(rep_files)} ({i/len(rep_files)*100:.1f}%)")
-        data = load_participant_data(S3_BUCKET_NAME, key)
-        if not data:
-            failed += 1
-            continue
-        row = extract_analysis_data(data)
-        if row:
-            all_rows.append(row)
-        else:
-            failed += 1
-    logger.info(f"S3 데이터 적재 완료 - 성공 {len(all_rows)}, 실패 {failed}")
-    df = pd.DataFrame(all_rows)
+    datas: List[Dict] = []
+    # S3 GET은 병렬로 처리하고 파싱된 문서를 파일 순서대로 수집
+    with ThreadPoolExecutor(max_workers=S3_LOAD_MAX_WORKERS) as executor:
+        results = executor.map(lambda key: load_participant_data(S3_BUCKET_NAME, key), rep_files.values())
+        for i, data in enumerate(results, start=1):
+            if i % 200 == 0:
+                logger.info(f"진행률: {i}/{len(rep_files)} ({i/len(rep_files)*100:.1f}%)")
+            if data:
+                datas.append(data)
+    df = extract_analysis_frame(datas)
+    logger.info(f"S3 데이터 적재 완료 - 성공 {len(df)}, 실패 {len(rep_files) - len(df)}")
     df = preprocess_dataframe(df)
-    logger.info(f"영어 레벨 분포: {df['english_level'].value_counts().to_dict()}")
+    logger.info(f"영어 레벨 분포: {value_counts_dict(df['english_level'])}")
     return df
 
-def load_data_if_needed():
-    """필요시 S3에서 데이터 로드 (캐싱)"""
-    global df_master
-    if df_master is None:
-        df_master = load_all_participant_data()
-        logger.info(f"데이터 로드 완료 (S3): {len(df_master)} 레코드")
+# Parquet에 그대로 저장할 수 없는 dict 컬럼 (JSON 문자열로 직렬화)
+DICT_COLUMNS = ['combo_scores', 'interview']
+
+def save_df_cache(df: pd.DataFrame) -> bool:
+    """전처리된 DataFrame을 로컬 Parquet 캐시로 저장 (성공 여부 반환)"""
+    try:
+        df_out = df.copy()
+        for col in DICT_COLUMNS:
+            if col in df_out.columns:
+                df_out[col] = df_out[col].map(lambda v: orjson.dumps(v).decode('utf-8'))
+        df_out.to_parquet(DF_CACHE_PATH, compression='zstd', index=False)
+        logger.info(f"데이터 캐시 저장 완료: {DF_CACHE_PATH}")
+        return True
+    except Exception as e:
+        logger.warning(f"데이터 캐시 저장 실패: {e}")
+        return False
+
+def is_df_cache_fresh() -> bool:
+    """로컬 캐시가 존재하고 S3 마커보다 최신인지 확인"""
+    if not os.path.exists(DF_CACHE_PATH):
+        return False
+    if s3_client is None or not S3_BUCKET_NAME:
+        return True
+    try:
+        marker = s3_client.head_object(Bucket=S3_BUCKET_NAME, Key=S3_DATA_MARKER_KEY)
+    except ClientError:
+        # 마커가 없으면 /reload 전까지 캐시 사용
+        return True
+    except Exception as e:
+        logger.warning(f"데이터 마커 확인 실패: {e}")
+        return True
+    return marker['LastModified'].timestamp() <= os.path.getmtime(DF_CACHE_PATH)
+
+def load_df_cache() -> Optional[pd.DataFrame]:
+    """유효한 로컬 Parquet 캐시가 있으면 로드"""
+    if not is_df_cache_fresh():
+        return None
+    try:
+        df = pd.read_parquet(DF_CACHE_PATH)
+        for col in DICT_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].map(orjson.loads)
+        return df
+    except Exception as e:
+        logger.warning(f"데이터 캐시 로드 실패: {e}")
+        return None
+
+def load_data_if_needed(use_cache: bool = True, force: bool = False):
+    """필요시 로컬 캐시 또는 S3에서 데이터 로드 (캐싱)
+
+    force=True면 이미 로드된 데이터가 있어도 재적재하며, 재적재가 끝날 때까지
+    다른 요청은 기존 df_master를 계속 사용
+    """
+    global df_master, df_cube, df_version, df_filter_values
+    if df_master is None or force:
+        with _df_master_lock:
+            if df_master is None or force:
+                df_loaded = load_df_cache() if use_cache else None
+                source = "캐시"
+                in_cache_file = df_loaded is not None
+                if df_loaded is None:
+                    df_loaded = load_all_participant_data()
+                    in_cache_file = save_df_cache(df_loaded)
+                    source = "S3"
+                # df_master가 보이는 시점에는 큐브/버전도 준비되어 있도록 먼저 갱신
+                df_cube = build_cube(df_loaded)
+                df_filter_values = {col: unique_sorted(df_loaded, col) for col in FILTER_VALUE_COLUMNS}
+                df_version = str(os.path.getmtime(DF_CACHE_PATH)) if in_cache_file else datetime.now().isoformat()
+                df_master = df_loaded
+                logger.info(f"데이터 로드 완료 ({source}): {len(df_master)} 레코드, 큐브 {len(df_cube)} 셀")
     return df_master
 
+# 가장 최근에 계산한 필터 마스크 (df 객체, 필터 키, mask)
+_last_filter_mask: Optional[Tuple[pd.DataFrame, tuple, np.ndarray]] = None
+
+def filter_key(filters: FilterRequest) -> tuple:
+    """필터 조건을 해시 가능한 정규화 튜플로 변환"""
+    return (
+        filters.age_min,
+        filters.age_max,
+        tuple(sorted(filters.locations)) if filters.locations else None,
+        tuple(sorted(filters.levels)) if filters.levels else None
+    )
+
+def filter_mask(df: pd.DataFrame, key: tuple) -> np.ndarray:
+    """정규화된 필터 키로 boolean mask 생성 (df_master와 df_cube 공용)"""
+    age_min, age_max, locations, levels = key
+    mask = np.ones(len(df), dtype=bool)
+    if age_min is not None:
+        mask &= df['age'].to_numpy() >= age_min
+    if age_max is not None:
+        mask &= df['age'].to_numpy() <= age_max
+    if locations:
+        mask &= df['location'].isin(locations).to_numpy()
+    if levels:
+        mask &= df['english_level'].isin(levels).to_numpy()
+    return mask
+
 def apply_filters(df: pd.DataFrame, filters: FilterRequest) -> pd.DataFrame:
-    """필터 적용"""
-    filtered_df = df.copy()
-    
-    if filters.age_min is not None:
-        filtered_df = filtered_df[filtered_df['age'] >= filters.age_min]
-    
-    if filters.age_max is not None:
-        filtered_df = filtered_df[filtered_df['age'] <= filters.age_max]
-    
-    if filters.locations:
-        filtered_df = filtered_df[filtered_df['location'].isin(filters.locations)]
-    
-    if filters.levels:
-        filtered_df = filtered_df[filtered_df['english_level'].isin(filters.levels)]
-    
-    return filtered_df
+    """필터 적용 (단일 boolean mask로 한 번만 인덱싱)"""
+    global _last_filter_mask
+    key = filter_key(filters)
+    age_min, age_max, locations, levels = key
+    if age_min is None and age_max is None and not locations and not levels:
+        return df
+
+    cached = _last_filter_mask
+    if cached is not None and cached[0] is df and cached[1] == key:
+        mask = cached[2]
+    else:
+        mask = filter_mask(df, key)
+        _last_filter_mask = (df, key, mask)
+
+    return df[mask]
+
+# ===== 가설 검정용 집계 큐브 ===== #
+
+# 큐브 차원: 필터 컬럼(age/location/english_level) + 가설별 그룹 컬럼
+CUBE_DIMENSIONS = ['age', 'age_group', 'location', 'english_level', 'is_metropolitan', 'english_speaking_experience']
+
+def build_cube(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    차원 조합별 count/sum/sum_sq 집계 큐브 생성
+    english_level이 차원에 포함되므로 한 셀의 점수(score)는 모두 동일
+    """
+    cube = (
+        df.groupby(CUBE_DIMENSIONS + ['english_level_numeric'], observed=True)
+        .size()
+        .rename('count')
+        .reset_index()
+    )
+    cube['score'] = cube['english_level_numeric'].astype(np.float64)
+    cube['sum'] = cube['count'] * cube['score']
+    cube['sum_sq'] = cube['sum'] * cube['score']
+    return cube
+
+def cube_moments(cube: pd.DataFrame) -> Tuple[int, float, float]:
+    """큐브 셀 집합의 표본 수, 평균, 표본분산(ddof=1)"""
+    n = int(cube['count'].sum())
+    if n == 0:
+        return 0, np.nan, np.nan
+    mean = cube['sum'].sum() / n
+    var = (cube['sum_sq'].sum() - n*mean*mean) / (n - 1) if n > 1 else np.nan
+    return n, float(mean), float(var)
+
+def cube_group_stats(cube: pd.DataFrame, group_col: str) -> Dict[str, Dict]:
+    """그룹별 count/mean/std (groupby().agg(['count', 'mean', 'std']).to_dict()와 같은 형식)"""
+    grouped = cube.groupby(group_col, observed=True)[['count', 'sum', 'sum_sq']].sum()
+    counts = grouped['count']
+    means = grouped['sum'] / counts
+    variances = (grouped['sum_sq'] - counts*means*means) / (counts - 1).where(counts > 1)
+    return pd.DataFrame({
+        'count': counts,
+        'mean': means,
+        'std': np.sqrt(variances.clip(lower=0))
+    }).to_dict()
+
+def cube_anova(cube: pd.DataFrame, group_col: str) -> Tuple[float, float]:
+    """일원분산분석 F-통계량과 p-value (scipy.stats.f_oneway와 동일)"""
+    grouped = cube.groupby(group_col, observed=True)[['count', 'sum', 'sum_sq']].sum()
+    counts = grouped['count'].to_numpy(dtype=np.float64)
+    sums = grouped['sum'].to_numpy()
+    means = sums / counts
+    grand_mean = sums.sum() / counts.sum()
+    ss_between = np.sum(counts * (means - grand_mean)**2)
+    ss_within = np.sum(grouped['sum_sq'].to_numpy() - counts*means*means)
+    df_between, df_within = len(counts) - 1, counts.sum() - len(counts)
+    f_stat = (ss_between / df_between) / (ss_within / df_within)
+    return float(f_stat), float(f_dist.sf(f_stat, df_between, df_within))
+
+def cube_contingency(cube: pd.DataFrame, group_col: str) -> pd.DataFrame:
+    """그룹 x 영어 레벨 교차표 (pd.crosstab과 동일한 빈도)"""
+    return cube.pivot_table(index=group_col, columns='english_level', values='count', aggfunc='sum', fill_value=0, observed=True)
+
+def expand_scores(cube: pd.DataFrame) -> np.ndarray:
+    """큐브 셀을 개별 점수 배열로 복원 (순위 기반 검정용)"""
+    return np.repeat(cube['score'].to_numpy(), cube['count'].to_numpy())
+
+def value_counts_dict(series: pd.Series, top: Optional[int] = None) -> Dict[str, int]:
+    """값별 빈도 dict (범주형 컬럼의 미관측 범주 제외)"""
+    counts = series.value_counts()
+    counts = counts[counts > 0]
+    if top is not None:
+        counts = counts.head(top)
+    return counts.to_dict()
+
+# 필터 목록을 제공하는 컬럼
+FILTER_VALUE_COLUMNS = ['location', 'english_level']
+
+def unique_sorted(df: pd.DataFrame, col: str) -> Tuple[str, ...]:
+    """컬럼의 정렬된 고유값 (빈 값 제외)"""
+    return tuple(sorted(str(value) for value in df[col].dropna().unique() if value))
+
+# 산점도 시리즈 최대 포인트 수
+CHART_MAX_POINTS = 5000
+
+# 연령 분포 히스토그램 최대 구간 수
+AGE_HISTOGRAM_BINS = 20
+
+def age_histogram(ages: np.ndarray, max_bins: int = AGE_HISTOGRAM_BINS) -> Dict[str, np.ndarray]:
+    """정수 연령의 히스토그램 (구간 폭은 1세 단위 정수, 구간 수는 max_bins 이하)"""
+    lo, hi = int(ages.min()), int(ages.max())
+    width = max(1, -(-(hi - lo + 1) // max_bins))
+    edges = np.arange(lo, hi + width + 1, width)
+    counts, edges = np.histogram(ages, bins=edges)
+    return {"counts": counts, "edges": edges}
+
+# 박스플롯 그룹당 전송할 이상치(울타리 밖 고유값) 최대 개수
+BOX_MAX_OUTLIERS = 5
+
+def box_stats(values: np.ndarray) -> Dict[str, object]:
+    """박스플롯 요약 통계 (사분위수, 1.5 IQR 이내 최소/최대 울타리, 평균, 울타리 밖 고유값)"""
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    is_inside = (values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)
+    inside = values[is_inside]
+    # 중앙값에서 먼 순으로 최대 BOX_MAX_OUTLIERS개만 유지
+    outliers = np.unique(values[~is_inside])
+    outliers = np.sort(outliers[np.argsort(-np.abs(outliers - median), kind='stable')[:BOX_MAX_OUTLIERS]])
+    return {
+        "q1": float(q1),
+        "median": float(median),
+        "q3": float(q3),
+        "lowerfence": float(inside.min()),
+        "upperfence": float(inside.max()),
+        "mean": float(values.mean()),
+        "count": int(len(values)),
+        "outliers": outliers.tolist()
+    }
+
+def grouped_box_stats(scores: np.ndarray, groups: Dict[str, np.ndarray]) -> Dict[str, Dict[str, object]]:
+    """그룹 마스크별 박스플롯 요약 통계 (빈 그룹 제외, 그룹 순서 유지)"""
+    return {name: box_stats(scores[mask]) for name, mask in groups.items() if mask.any()}
+
+# Arrow IPC 스트림 응답 타입 (Accept 헤더로 요청 시 JSON 대신 사용)
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+def arrow_response(columns: Dict[str, Any]) -> Response:
+    """컬럼 배열들을 Arrow IPC 스트림 바이트로 직렬화한 응답"""
+    table = pa.table(columns)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return Response(content=sink.getvalue().to_pybytes(), media_type=ARROW_STREAM_MEDIA_TYPE)
+
+# 산점도 LTTB 기본 출력 포인트 수
+LTTB_DEFAULT_POINTS = 2000
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """x 오름차순 정렬된 시리즈의 LTTB(Largest-Triangle-Three-Buckets) 선택 인덱스"""
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+    # 첫/마지막 포인트 고정, 나머지를 n_out - 2개 버킷으로 분할
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    prev = 0
+    for b in range(n_out - 2):
+        start, end = edges[b], edges[b + 1]
+        # 다음 버킷 평균점 (마지막 버킷은 마지막 포인트)
+        if b + 2 < len(edges):
+            next_x = x[end:edges[b + 2]].mean()
+            next_y = y[end:edges[b + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        area = np.abs(
+            (x[prev] - next_x) * (y[start:end] - y[prev])
+            - (x[prev] - x[start:end]) * (next_y - y[prev])
+        )
+        prev = start + int(area.argmax())
+        selected[b + 1] = prev
+    return selected
+
+async def load_filtered_data(filters: FilterRequest) -> pd.DataFrame:
+    """이벤트 루프를 막지 않도록 데이터 로드 및 필터링을 워커 스레드에서 수행"""
+    df = await asyncio.to_thread(load_data_if_needed)
+    return await asyncio.to_thread(apply_filters, df, filters)
+
+async def load_filtered_cube(filters: FilterRequest) -> pd.DataFrame:
+    """필터 조건에 맞는 집계 큐브 셀 (비용은 전체 행 수가 아닌 큐브 크기에 비례)"""
+    await asyncio.to_thread(load_data_if_needed)
+    cube = df_cube
+    return cube[filter_mask(cube, filter_key(filters))]
 
 # API 엔드포인트들
 @app.get("/")
@@ -287,9 +631,7 @@ async def root():
 @app.post("/reload")
 async def reload_data():
     """S3에서 데이터를 다시 로드하여 캐시 갱신"""
-    global df_master
-    df_master = None
-    df = load_data_if_needed()
+    df = await asyncio.to_thread(load_data_if_needed, False, True)
     return {
         "status": "reloaded",
         "record_count": len(df),
@@ -300,11 +642,12 @@ async def reload_data():
 async def health_check():
     """헬스 체크"""
     try:
-        df = load_data_if_needed()
+        df = await asyncio.to_thread(load_data_if_needed)
         return {
             "status": "healthy",
             "data_loaded": True,
             "record_count": len(df),
+            "data_version": df_version,
             "timestamp": datetime.now().isoformat()
         }
     except Exception as e:
@@ -317,8 +660,7 @@ async def health_check():
 @app.post("/data/summary")
 async def get_data_summary(filters: FilterRequest = FilterRequest()) -> DataSummary:
     """데이터 요약 정보"""
-    df = load_data_if_needed()
-    df_filtered = apply_filters(df, filters)
+    df_filtered = await load_filtered_data(filters)
     
     if len(df_filtered) == 0:
         raise HTTPException(status_code=400, detail="필터 조건에 맞는 데이터가 없습니다.")
@@ -327,8 +669,8 @@ async def get_data_summary(filters: FilterRequest = FilterRequest()) -> DataSumm
         total_participants=len(df_filtered),
         age_range={"min": int(df_filtered['age'].min()), "max": int(df_filtered['age'].max())},
         average_age=float(df_filtered['age'].mean()),
-        location_distribution=df_filtered['location'].value_counts().head().to_dict(),
-        level_distribution=df_filtered['english_level'].value_counts().to_dict(),
+        location_distribution=value_counts_dict(df_filtered['location'], top=5),
+        level_distribution=value_counts_dict(df_filtered['english_level']),
         metropolitan_ratio=float(df_filtered['is_metropolitan'].mean()),
         experience_ratio=float(df_filtered['english_speaking_experience'].mean())
     )
@@ -336,41 +678,34 @@ async def get_data_summary(filters: FilterRequest = FilterRequest()) -> DataSumm
 @app.get("/data/locations")
 async def get_locations() -> List[str]:
     """사용 가능한 지역 목록"""
-    df = load_data_if_needed()
-    # NaN 값 제거하고 정렬
-    locations = df['location'].dropna().unique().tolist()
-    # 문자열로 변환하고 정렬
-    locations = sorted([str(location) for location in locations if location])
-    return locations
+    await asyncio.to_thread(load_data_if_needed)
+    return list(df_filter_values['location'])
 
 @app.get("/data/levels") 
 async def get_levels() -> List[str]:
     """사용 가능한 영어 레벨 목록"""
-    df = load_data_if_needed()
-    # NaN 값 제거하고 정렬
-    levels = df['english_level'].dropna().unique().tolist()
-    # 문자열로 변환하고 정렬
-    levels = sorted([str(level) for level in levels if level])
-    return levels
+    await asyncio.to_thread(load_data_if_needed)
+    return list(df_filter_values['english_level'])
 
 @app.post("/analysis/hypothesis1")
 async def analyze_hypothesis1(filters: FilterRequest = FilterRequest()) -> HypothesisResult:
     """가설 1: 연령대가 낮을수록 점수가 높을 것이다"""
-    df = load_data_if_needed()
-    df_filtered = apply_filters(df, filters)
+    cube = await load_filtered_cube(filters)
     
-    if len(df_filtered) < 10:
+    if cube['count'].sum() < 10:
         raise HTTPException(status_code=400, detail="분석에 충분한 데이터가 없습니다.")
     
-    # 상관관계 분석
-    corr_pearson, p_pearson = pearsonr(df_filtered['age'], df_filtered['english_level_numeric'])
-    corr_spearman, p_spearman = spearmanr(df_filtered['age'], df_filtered['english_level_numeric'])
+    # 상관관계 분석 (셀 빈도를 가중치로 사용)
+    weights = cube['count'].to_numpy(dtype=np.float64)
+    ages = cube['age'].to_numpy(dtype=np.float64)
+    scores = cube['score'].to_numpy()
+    corr_pearson, p_pearson = weighted_pearsonr(ages, scores, weights)
+    # 스피어만 상관 = 평균 순위의 피어슨 상관
+    corr_spearman, p_spearman = weighted_pearsonr(weighted_rank(ages, weights), weighted_rank(scores, weights), weights)
     
     # ANOVA 분석
-    age_groups = df_filtered['age_group'].unique()
-    if len(age_groups) > 1:
-        groups_data = [df_filtered[df_filtered['age_group'] == group]['english_level_numeric'] for group in age_groups]
-        f_stat, p_anova = f_oneway(*groups_data)
+    if cube['age_group'].nunique() > 1:
+        f_stat, p_anova = cube_anova(cube, 'age_group')
     else:
         f_stat, p_anova = 0, 1
     
@@ -395,7 +730,7 @@ async def analyze_hypothesis1(filters: FilterRequest = FilterRequest()) -> Hypot
             "spearman_p_value": p_spearman,
             "anova_f_stat": f_stat,
             "anova_p_value": p_anova,
-            "age_group_stats": df_filtered.groupby('age_group')['english_level_numeric'].agg(['count', 'mean', 'std']).to_dict()
+            "age_group_stats": cube_group_stats(cube, 'age_group')
         },
         conclusion=conclusion
     )
@@ -403,29 +738,30 @@ async def analyze_hypothesis1(filters: FilterRequest = FilterRequest()) -> Hypot
 @app.post("/analysis/hypothesis2")
 async def analyze_hypothesis2(filters: FilterRequest = FilterRequest()) -> HypothesisResult:
     """가설 2: 수도권일수록 점수가 높을 것이다"""
-    df = load_data_if_needed()
-    df_filtered = apply_filters(df, filters)
+    cube = await load_filtered_cube(filters)
     
-    metro_scores = df_filtered[df_filtered['is_metropolitan'] == True]['english_level_numeric']
-    non_metro_scores = df_filtered[df_filtered['is_metropolitan'] == False]['english_level_numeric']
+    in_group = cube['is_metropolitan'].to_numpy(dtype=bool)
+    metro_cube, non_metro_cube = cube[in_group], cube[~in_group]
+    metro_count, metro_mean, metro_var = cube_moments(metro_cube)
+    non_metro_count, non_metro_mean, non_metro_var = cube_moments(non_metro_cube)
     
-    if len(metro_scores) < 5 or len(non_metro_scores) < 5:
+    if metro_count < 5 or non_metro_count < 5:
         raise HTTPException(status_code=400, detail="각 그룹에 충분한 데이터가 없습니다.")
     
     # t-test
-    t_stat, p_ttest = ttest_ind(metro_scores, non_metro_scores)
-    effect_size = calculate_effect_size(metro_scores, non_metro_scores)
+    t_stat, p_ttest = student_ttest(metro_count, metro_mean, metro_var, non_metro_count, non_metro_mean, non_metro_var)
+    effect_size = calculate_effect_size(metro_count, metro_mean, metro_var, non_metro_count, non_metro_mean, non_metro_var)
     
-    # Mann-Whitney U test
-    u_stat, p_mannwhitney = mannwhitneyu(metro_scores, non_metro_scores, alternative='two-sided')
+    # Mann-Whitney U test (순위 검정이므로 개별 점수로 복원)
+    u_stat, p_mannwhitney = await asyncio.to_thread(mannwhitneyu, expand_scores(metro_cube), expand_scores(non_metro_cube), alternative='two-sided')
     
     # 카이제곱 검정
-    contingency_table = pd.crosstab(df_filtered['is_metropolitan'], df_filtered['english_level'])
+    contingency_table = cube_contingency(cube, 'is_metropolitan')
     chi2, p_chi2, dof, expected = chi2_contingency(contingency_table)
     
     # 결론
     if p_ttest < 0.05:
-        if metro_scores.mean() < non_metro_scores.mean():
+        if metro_mean < non_metro_mean:
             conclusion = "가설 채택: 수도권이 비수도권보다 영어 실력이 높습니다."
         else:
             conclusion = "가설 기각: 비수도권이 수도권보다 영어 실력이 높습니다."
@@ -434,14 +770,14 @@ async def analyze_hypothesis2(filters: FilterRequest = FilterRequest()) -> Hypot
     
     return HypothesisResult(
         hypothesis="수도권일수록 점수가 높을 것이다",
-        result="기각" if (p_ttest < 0.05 and metro_scores.mean() > non_metro_scores.mean()) else "채택" if (p_ttest < 0.05 and metro_scores.mean() < non_metro_scores.mean()) else "판단불가",
+        result="기각" if (p_ttest < 0.05 and metro_mean > non_metro_mean) else "채택" if (p_ttest < 0.05 and metro_mean < non_metro_mean) else "판단불가",
         p_value=p_ttest,
         effect_size=effect_size,
         statistics={
-            "metro_mean": float(metro_scores.mean()),
-            "non_metro_mean": float(non_metro_scores.mean()),
-            "metro_count": len(metro_scores),
-            "non_metro_count": len(non_metro_scores),
+            "metro_mean": metro_mean,
+            "non_metro_mean": non_metro_mean,
+            "metro_count": metro_count,
+            "non_metro_count": non_metro_count,
             "t_statistic": t_stat,
             "t_p_value": p_ttest,
             "effect_size": effect_size,
@@ -457,29 +793,30 @@ async def analyze_hypothesis2(filters: FilterRequest = FilterRequest()) -> Hypot
 @app.post("/analysis/hypothesis3")
 async def analyze_hypothesis3(filters: FilterRequest = FilterRequest()) -> HypothesisResult:
     """가설 3: 영어권 거주 경험이 있을수록 점수가 높을 것이다"""
-    df = load_data_if_needed()
-    df_filtered = apply_filters(df, filters)
+    cube = await load_filtered_cube(filters)
     
-    exp_scores = df_filtered[df_filtered['english_speaking_experience'] == True]['english_level_numeric']
-    no_exp_scores = df_filtered[df_filtered['english_speaking_experience'] == False]['english_level_numeric']
+    in_group = cube['english_speaking_experience'].to_numpy(dtype=bool)
+    exp_cube, no_exp_cube = cube[in_group], cube[~in_group]
+    exp_count, exp_mean, exp_var = cube_moments(exp_cube)
+    no_exp_count, no_exp_mean, no_exp_var = cube_moments(no_exp_cube)
     
-    if len(exp_scores) < 5 or len(no_exp_scores) < 5:
+    if exp_count < 5 or no_exp_count < 5:
         raise HTTPException(status_code=400, detail="각 그룹에 충분한 데이터가 없습니다.")
     
     # t-test
-    t_stat, p_ttest = ttest_ind(exp_scores, no_exp_scores)
-    effect_size = calculate_effect_size(exp_scores, no_exp_scores)
+    t_stat, p_ttest = student_ttest(exp_count, exp_mean, exp_var, no_exp_count, no_exp_mean, no_exp_var)
+    effect_size = calculate_effect_size(exp_count, exp_mean, exp_var, no_exp_count, no_exp_mean, no_exp_var)
     
-    # Mann-Whitney U test
-    u_stat, p_mannwhitney = mannwhitneyu(exp_scores, no_exp_scores, alternative='two-sided')
+    # Mann-Whitney U test (순위 검정이므로 개별 점수로 복원)
+    u_stat, p_mannwhitney = await asyncio.to_thread(mannwhitneyu, expand_scores(exp_cube), expand_scores(no_exp_cube), alternative='two-sided')
     
     # 카이제곱 검정
-    contingency_table = pd.crosstab(df_filtered['english_speaking_experience'], df_filtered['english_level'])
+    contingency_table = cube_contingency(cube, 'english_speaking_experience')
     chi2, p_chi2, dof, expected = chi2_contingency(contingency_table)
     
     # 결론
     if p_ttest < 0.05:
-        if exp_scores.mean() < no_exp_scores.mean():
+        if exp_mean < no_exp_mean:
             conclusion = "가설 채택: 영어권 거주 경험이 있는 사람들의 영어 실력이 더 높습니다."
         else:
             conclusion = "가설 기각: 영어권 거주 경험이 없는 사람들의 영어 실력이 더 높습니다."
@@ -488,14 +825,14 @@ async def analyze_hypothesis3(filters: FilterRequest = FilterRequest()) -> Hypot
     
     return HypothesisResult(
         hypothesis="영어권 거주 경험이 있을수록 점수가 높을 것이다",
-        result="기각" if (p_ttest < 0.05 and exp_scores.mean() > no_exp_scores.mean()) else "채택" if (p_ttest < 0.05 and exp_scores.mean() < no_exp_scores.mean()) else "판단불가",
+        result="기각" if (p_ttest < 0.05 and exp_mean > no_exp_mean) else "채택" if (p_ttest < 0.05 and exp_mean < no_exp_mean) else "판단불가",
         p_value=p_ttest,
         effect_size=effect_size,
         statistics={
-            "experience_mean": float(exp_scores.mean()),
-            "no_experience_mean": float(no_exp_scores.mean()),
-            "experience_count": len(exp_scores),
-            "no_experience_count": len(no_exp_scores),
+            "experience_mean": exp_mean,
+            "no_experience_mean": no_exp_mean,
+            "experience_count": exp_count,
+            "no_experience_count": no_exp_count,
             "t_statistic": t_stat,
             "t_p_value": p_ttest,
             "effect_size": effect_size,
@@ -509,32 +846,69 @@ async def analyze_hypothesis3(filters: FilterRequest = FilterRequest()) -> Hypot
     )
 
 @app.post("/data/chart_data")
-async def get_chart_data(filters: FilterRequest = FilterRequest()) -> Dict[str, Any]:
+async def get_chart_data(filters: FilterRequest = FilterRequest()) -> Response:
     """차트 생성을 위한 데이터"""
-    df = load_data_if_needed()
-    df_filtered = apply_filters(df, filters)
+    df_filtered = await load_filtered_data(filters)
     
     if len(df_filtered) == 0:
         raise HTTPException(status_code=400, detail="필터 조건에 맞는 데이터가 없습니다.")
     
-    return {
-        "age_vs_score": {
-            "ages": df_filtered['age'].tolist(),
-            "scores": df_filtered['english_level_numeric'].tolist(),
-            "levels": df_filtered['english_level'].tolist()
-        },
-        "age_group_stats": df_filtered.groupby('age_group')['english_level_numeric'].agg(['count', 'mean', 'std']).to_dict(),
-        "metro_comparison": {
-            "metro_scores": df_filtered[df_filtered['is_metropolitan'] == True]['english_level_numeric'].tolist(),
-            "non_metro_scores": df_filtered[df_filtered['is_metropolitan'] == False]['english_level_numeric'].tolist()
-        },
-        "experience_comparison": {
-            "exp_scores": df_filtered[df_filtered['english_speaking_experience'] == True]['english_level_numeric'].tolist(),
-            "no_exp_scores": df_filtered[df_filtered['english_speaking_experience'] == False]['english_level_numeric'].tolist()
+    scores = df_filtered['english_level_numeric'].to_numpy()
+    is_metro = df_filtered['is_metropolitan'].to_numpy(dtype=bool)
+    has_exp = df_filtered['english_speaking_experience'].to_numpy(dtype=bool)
+    # 연령대는 전처리에서 searchsorted로 만든 범주 코드를 그대로 비교
+    age_group_codes = df_filtered['age_group'].cat.codes.to_numpy()
+    
+    payload = {
+        # 연령 분포는 원시 연령 대신 구간별 빈도만 전송
+        "age_histogram": age_histogram(df_filtered['age'].to_numpy()),
+        "age_group_stats": df_filtered.groupby('age_group', observed=True)['english_level_numeric'].agg(['count', 'mean', 'std']).to_dict(),
+        # 박스플롯은 원시 점수 대신 전체 필터 데이터의 그룹별 요약 통계만 전송
+        "box_stats": {
+            "age_group": grouped_box_stats(scores, {
+                label: age_group_codes == code for code, label in enumerate(df_filtered['age_group'].cat.categories)
+            }),
+            "region": grouped_box_stats(scores, {"수도권": is_metro, "비수도권": ~is_metro}),
+            "experience": grouped_box_stats(scores, {"경험 있음": has_exp, "경험 없음": ~has_exp})
         },
-        "level_distribution": df_filtered['english_level'].value_counts().to_dict(),
-        "location_stats": df_filtered.groupby('location')['english_level_numeric'].agg(['count', 'mean']).to_dict()
+        "level_distribution": value_counts_dict(df_filtered['english_level']),
+        "location_stats": df_filtered.groupby('location', observed=True)['english_level_numeric'].agg(['count', 'mean']).to_dict()
+    }
+    # NumPy 배열을 리스트 변환 없이 바로 직렬화
+    return Response(content=orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY), media_type="application/json")
+
+@app.post("/data/age_vs_score")
+async def get_age_vs_score(
+    request: Request,
+    filters: FilterRequest = FilterRequest(),
+    n: int = Query(LTTB_DEFAULT_POINTS, ge=3, le=CHART_MAX_POINTS)
+) -> Response:
+    """연령 vs 점수 산점도 데이터 (연령순 정렬 후 LTTB로 최대 n개 축소, Arrow IPC 스트림 지원)"""
+    df_filtered = await load_filtered_data(filters)
+    
+    if len(df_filtered) == 0:
+        raise HTTPException(status_code=400, detail="필터 조건에 맞는 데이터가 없습니다.")
+    
+    order = np.argsort(df_filtered['age'].to_numpy(), kind='stable')
+    ages = df_filtered['age'].to_numpy()[order]
+    scores = df_filtered['english_level_numeric'].to_numpy()[order]
+    idx = await asyncio.to_thread(lttb_indices, ages, scores, n)
+    levels = df_filtered['english_level'].to_numpy()[order][idx]
+    
+    if ARROW_STREAM_MEDIA_TYPE in request.headers.get("accept", ""):
+        # 레벨은 사전 인코딩하여 문자열 반복 전송 방지
+        return arrow_response({
+            "age": ages[idx],
+            "score": scores[idx],
+            "level": pa.array(levels).dictionary_encode()
+        })
+    
+    payload = {
+        "ages": ages[idx],
+        "scores": scores[idx],
+        "levels": levels.tolist()
     }
+    return Response(content=orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY), media_type="application/json")
 
 if __name__ == "__main__":
     import uvicorn
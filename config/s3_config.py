@@ -3,26 +3,54 @@ S3 설정 및 유틸리티 함수
 """
 
 import os
+from functools import lru_cache
+
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 
+MB = 1024 * 1024
+
+# 대용량 파일은 8MB 단위 멀티파트로 전송
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * MB,
+    multipart_chunksize=8 * MB,
+    max_concurrency=16,
+    use_threads=True
+)
+
+
+@lru_cache(maxsize=None)
+def get_s3_client():
+    """프로세스 내에서 공유하는 S3 클라이언트 (재시도 + keep-alive)"""
+    session = boto3.session.Session(
+        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
+        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+        region_name=os.getenv('AWS_REGION', 'ap-northeast-2')
+    )
+    return session.client(
+        's3',
+        config=Config(
+            max_pool_connections=64,
+            tcp_keepalive=True,
+            retries={'max_attempts': 5, 'mode': 'adaptive'}
+        )
+    )
+
+
 class S3Manager:
     """S3 파일 업로드/다운로드 관리자"""
     
     def __init__(self):
-        self.s3_client = boto3.client(
-            's3',
-            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-            region_name=os.getenv('AWS_REGION', 'ap-northeast-2')
-        )
+        self.s3_client = get_s3_client()
         self.bucket_name = os.getenv('S3_BUCKET_NAME')
         
     def upload_file(self, file_path: str, s3_key: str) -> bool:
         """파일을 S3에 업로드"""
         try:
-            self.s3_client.upload_file(file_path, self.bucket_name, s3_key)
+            self.s3_client.upload_file(file_path, self.bucket_name, s3_key, Config=TRANSFER_CONFIG)
             print(f"업로드 성공: {s3_key}")
             return True
         except ClientError as e:
@@ -1,12 +1,16 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
-import plotly.express as px
+import pyarrow as pa
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import numpy as np
-import json
 from typing import Dict, List, Any, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+import threading
+
+from shared.constants import LEVEL_MAPPING, LEVEL_NAMES, AGE_GROUPS
 
 # 페이지 설정
 st.set_page_config(
@@ -18,50 +22,133 @@ st.set_page_config(
 
 # API 서버 설정
 API_BASE_URL = "http://localhost:8002"
+# 동시 API 요청 수
+API_MAX_WORKERS = 6
+# 표 형태 응답은 Arrow IPC 스트림으로 요청 (미지원 엔드포인트는 JSON 응답)
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+API_HEADERS = {"Accept": f"{ARROW_STREAM_MEDIA_TYPE}, application/json"}
 
-# 영어 레벨 매핑
-LEVEL_MAPPING = {
-    'IG': 1, 'TL': 2, 'TM': 3, 'TH': 4, 'NA': 5
-}
+# Plotly 차트 공통 설정 (컨테이너 크기 변화 시 재레이아웃 대신 리사이즈)
+PLOTLY_CONFIG = {'staticPlot': False, 'responsive': True}
 
-LEVEL_NAMES = {
-    'IG': 'Intermediate General',
-    'TL': 'Talented Low', 
-    'TM': 'Talented Middle',
-    'TH': 'Talented High',
-    'NA': 'Native-like'
-}
+# 차트 범주 순서 (레벨 낮은 순, 연령대 오름차순)
+LEVEL_ORDER = sorted(LEVEL_MAPPING, key=LEVEL_MAPPING.get)
+AGE_GROUP_ORDER = list(AGE_GROUPS)
 
-@st.cache_data(ttl=300)  # 5분 캐시
-def api_request(endpoint: str, method: str = "GET", data: dict = None) -> dict:
-    """API 요청 함수"""
-    try:
-        url = f"{API_BASE_URL}{endpoint}"
-        
-        if method == "GET":
-            response = requests.get(url)
-        elif method == "POST":
-            response = requests.post(url, json=data or {})
-        else:
-            raise ValueError(f"지원하지 않는 HTTP 메서드: {method}")
-        
-        response.raise_for_status()
-        return response.json()
+# 영어 레벨 범례 라벨 (예: "IG (Intermediate General)")
+LEVEL_LEGEND = {level: f"{level} ({name})" for level, name in LEVEL_NAMES.items()}
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """리런/세션 간 keep-alive 커넥션을 재사용하는 HTTP 세션"""
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=API_MAX_WORKERS, pool_maxsize=API_MAX_WORKERS))
+    return session
+
+def fetch_api_response(endpoint: str, method: str = "GET", data_items: tuple = ()) -> Any:
+    """API 요청 함수 (요청 본문은 freeze_filters로 정규화한 튜플, 실패 시 예외 발생)
+    JSON 응답은 dict/list, Arrow IPC 스트림 응답은 DataFrame으로 반환"""
+    url = f"{API_BASE_URL}{endpoint}"
+    
+    if method == "GET":
+        response = get_http_session().get(url, headers=API_HEADERS)
+    elif method == "POST":
+        response = get_http_session().post(url, json=thaw_filters(data_items), headers=API_HEADERS)
+    else:
+        raise ValueError(f"지원하지 않는 HTTP 메서드: {method}")
     
-    except requests.exceptions.ConnectionError:
+    response.raise_for_status()
+    if response.headers.get("content-type", "").startswith(ARROW_STREAM_MEDIA_TYPE):
+        return pa.ipc.open_stream(response.content).read_all().to_pandas()
+    return response.json()
+
+def show_api_error(error: Exception):
+    """API 요청 실패 메시지 표시 후 스크립트 중단 (스크립트 스레드에서만 호출)"""
+    if isinstance(error, requests.exceptions.ConnectionError):
         st.error("❌ API 서버에 연결할 수 없습니다. 서버가 실행 중인지 확인해주세요.")
-        st.stop()
-    except requests.exceptions.HTTPError as e:
-        st.error(f"❌ API 요청 실패: {e}")
-        st.stop()
+    elif isinstance(error, requests.exceptions.HTTPError):
+        st.error(f"❌ API 요청 실패: {error}")
+    else:
+        st.error(f"❌ 오류 발생: {error}")
+    st.stop()
+
+def send_api_request(endpoint: str, method: str = "GET", data_items: tuple = ()) -> Any:
+    """API 요청 (실패 시 오류 표시 후 중단)"""
+    try:
+        return fetch_api_response(endpoint, method, data_items)
     except Exception as e:
-        st.error(f"❌ 오류 발생: {e}")
-        st.stop()
+        show_api_error(e)
+
+# 디스크에 영속 캐시하여 앱 재시작 후에도 재사용 (TTL 대신 서버 데이터 버전으로 무효화, 실패 응답은 캐시하지 않음)
+@st.cache_data(persist="disk", max_entries=256)
+def cached_api_request(endpoint: str, method: str, data_items: tuple, data_version: Optional[str]) -> Any:
+    """데이터 버전별 API 응답 캐시 (data_version은 캐시 키로만 사용)"""
+    return fetch_api_response(endpoint, method, data_items)
+
+def api_request(endpoint: str, method: str = "GET", data_items: tuple = ()) -> Any:
+    """현재 서버 데이터 버전 기준으로 캐시된 API 요청 (실패 시 오류 표시 후 중단)"""
+    try:
+        return cached_api_request(endpoint, method, data_items, st.session_state.get("data_version"))
+    except Exception as e:
+        show_api_error(e)
 
+def submit_api_many(calls: List[tuple]) -> List[Future]:
+    """독립적인 API 요청들을 동시에 시작 (Future 결과는 응답, 실패한 요청은 예외 객체)"""
+    if not calls:
+        return []
+    data_version = st.session_state.get("data_version")
+    
+    def _request(call: tuple) -> Any:
+        try:
+            return cached_api_request(*call, data_version)
+        except Exception as e:
+            return e
+    
+    # 워커 스레드에서도 캐시가 동작하도록 스크립트 컨텍스트 전달 (오류 표시는 결과를 받은 스크립트 스레드에서)
+    ctx = get_script_run_ctx()
+    executor = ThreadPoolExecutor(
+        max_workers=min(API_MAX_WORKERS, len(calls)),
+        initializer=add_script_run_ctx,
+        initargs=(None, ctx)
+    )
+    futures = [executor.submit(_request, call) for call in calls]
+    # 제출된 요청은 끝까지 실행하되 완료를 기다리지 않음
+    executor.shutdown(wait=False)
+    return futures
+
+def api_request_many(calls: List[tuple]) -> List[Any]:
+    """독립적인 API 요청들을 동시에 실행 (결과는 요청 순서대로, 하나라도 실패하면 오류 표시 후 중단)"""
+    results = [future.result() for future in submit_api_many(calls)]
+    for result in results:
+        if isinstance(result, Exception):
+            show_api_error(result)
+    return results
+
+def fetch_dashboard_data(filters: tuple, tab_endpoints: List[str]) -> tuple:
+    """요약/차트 데이터를 가져오면서 선택된 탭의 분석 API를 동시에 미리 요청
+    탭 요청은 기다리지 않고 Future로 반환 (실패는 무시하고 탭 렌더링 시 해당 탭 안에서 오류 표시)
+    필터와 서버 데이터 버전이 직전 리런과 같으면 session_state에 보관한 요약/차트 데이터를 캐시 조회 없이 재사용"""
+    tab_calls = [(endpoint, "POST", filters) for endpoint in tab_endpoints]
+    data_version = st.session_state.get("data_version")
+    last = st.session_state.get("last_dashboard_data")
+    if last is not None and last[0] == filters and last[1] == data_version:
+        return last[2], last[3], submit_api_many(tab_calls)
+    
+    summary_future, chart_future, *tab_futures = submit_api_many(
+        [("/data/summary", "POST", filters), ("/data/chart_data", "POST", filters)] + tab_calls
+    )
+    summary, chart_data = summary_future.result(), chart_future.result()
+    for result in (summary, chart_data):
+        if isinstance(result, Exception):
+            show_api_error(result)
+    st.session_state["last_dashboard_data"] = (filters, data_version, summary, chart_data)
+    return summary, chart_data, tab_futures
+
+@st.cache_data(ttl=30)  # 일시적 장애가 빨리 드러나도록 짧게 캐시
 def check_api_health():
     """API 서버 상태 확인"""
     try:
-        health = api_request("/health")
+        health = send_api_request("/health")
         if health.get("status") == "healthy":
             return True, health
         else:
@@ -69,12 +156,29 @@ def check_api_health():
     except:
         return False, None
 
-def get_filter_data():
-    """필터링을 위한 데이터 가져오기"""
-    locations = api_request("/data/locations")
-    levels = api_request("/data/levels")
+@st.cache_data(persist="disk")  # 지역/레벨 목록은 데이터 버전이 바뀔 때만 갱신
+def get_filter_data(data_version: Optional[str]):
+    """필터링을 위한 데이터 가져오기 (data_version은 캐시 키로만 사용)"""
+    locations, levels = api_request_many([("/data/locations", "GET", ()), ("/data/levels", "GET", ())])
     return locations, levels
 
+@st.cache_resource
+def disk_cache_state() -> dict:
+    """디스크 캐시에 기록 중인 서버 데이터 버전 (프로세스 전역, 세션 간 공유)"""
+    return {"data_version": None, "lock": threading.Lock()}
+
+def prune_disk_cache(data_version: Optional[str]):
+    """서버 데이터 버전이 바뀌면 이전 버전의 디스크 캐시 파일 삭제
+    (persist="disk" 캐시는 디스크에서 max_entries/TTL을 적용하지 않음, 앱 시작 후 첫 버전은 기존 파일 유지)"""
+    state = disk_cache_state()
+    with state["lock"]:
+        if data_version == state["data_version"]:
+            return
+        if state["data_version"] is not None:
+            cached_api_request.clear()
+            get_filter_data.clear()
+        state["data_version"] = data_version
+
 def create_filter_request(age_range, selected_locations, selected_levels):
     """필터 요청 객체 생성"""
     filters = {}
@@ -92,6 +196,95 @@ def create_filter_request(age_range, selected_locations, selected_levels):
     
     return filters
 
+def freeze_filters(filters: dict) -> tuple:
+    """필터 dict를 키 정렬된 해시 가능한 튜플로 변환 (리스트 값은 정렬된 튜플)"""
+    return tuple(
+        (key, tuple(sorted(value)) if isinstance(value, list) else value)
+        for key, value in sorted(filters.items())
+    )
+
+def thaw_filters(filter_items: tuple) -> dict:
+    """freeze_filters 결과를 JSON 요청 본문 dict로 복원"""
+    return {key: list(value) if isinstance(value, tuple) else value for key, value in filter_items}
+
+# 차트 생성 결과 캐시 (피클 직렬화 없이 같은 Figure 객체를 재사용, 입력 데이터가 같으면 재생성하지 않음)
+@st.cache_resource(ttl=300, max_entries=128)
+def box_figure(stats: Dict[str, dict], title: str, x_label: str, category_order: Optional[List[str]] = None) -> go.Figure:
+    """서버에서 계산한 그룹별 사분위수로 박스플롯 생성 (원시 점수 미전송, 이상치는 점으로 오버레이)"""
+    names = list(stats.keys())
+    fig = go.Figure(go.Box(
+        x=names,
+        q1=[stats[name]['q1'] for name in names],
+        median=[stats[name]['median'] for name in names],
+        q3=[stats[name]['q3'] for name in names],
+        lowerfence=[stats[name]['lowerfence'] for name in names],
+        upperfence=[stats[name]['upperfence'] for name in names],
+        mean=[stats[name]['mean'] for name in names],
+        boxpoints=False,
+        name="분포"
+    ))
+    outlier_x = [name for name in names for _ in stats[name].get('outliers', [])]
+    outlier_y = [value for name in names for value in stats[name].get('outliers', [])]
+    if outlier_x:
+        fig.add_trace(go.Scatter(
+            x=outlier_x, y=outlier_y, mode='markers', name="이상치",
+            marker=dict(symbol='circle-open', size=8)
+        ))
+    fig.update_layout(showlegend=False)
+    fig.update_layout(title=title, xaxis_title=x_label, yaxis_title="영어 실력 점수")
+    if category_order:
+        fig.update_xaxes(categoryorder='array', categoryarray=category_order)
+    return fig
+
+@st.cache_resource(ttl=300, max_entries=128)
+def age_scatter_figure(df_scatter: pd.DataFrame) -> go.Figure:
+    """연령 vs 점수 산점도 (레벨별 WebGL Scattergl 트레이스, 레벨 순서대로)"""
+    ages = df_scatter['age'].to_numpy()
+    scores = df_scatter['score'].to_numpy()
+    levels = df_scatter['level'].astype(str).to_numpy()
+    
+    fig = go.Figure()
+    for level in LEVEL_ORDER + sorted(set(levels) - set(LEVEL_ORDER)):
+        mask = levels == level
+        if mask.any():
+            fig.add_trace(go.Scattergl(x=ages[mask], y=scores[mask], mode='markers', name=level))
+    fig.update_layout(
+        title="연령 vs 영어 실력 상관관계",
+        xaxis_title="연령",
+        yaxis_title="영어 실력 점수",
+        legend_title_text="level"
+    )
+    return fig
+
+@st.cache_data(ttl=300, max_entries=128)
+def location_frame(location_stats: dict) -> pd.DataFrame:
+    """지역 인덱스 기준 평균/참가자 수 DataFrame (가설 2 탭과 개요 탭에서 공유)"""
+    loc_df = pd.DataFrame({'mean': location_stats['mean'], 'count': location_stats['count']})
+    return loc_df.fillna({'count': 0}).astype({'count': int}).rename_axis('location')
+
+@st.cache_resource(ttl=300, max_entries=128)
+def location_bar_figure(loc_df: pd.DataFrame) -> go.Figure:
+    """지역별 평균 점수 막대그래프 (30명 이상 지역 중 평균 하위 10개)"""
+    # 30명 이상인 지역 중 평균 하위 10개만 부분 정렬로 선택
+    location_means = loc_df.query('count >= 30').nsmallest(10, 'mean').reset_index()
+    
+    fig = go.Figure(go.Bar(x=location_means['mean'], y=location_means['location'], orientation='h'))
+    fig.update_layout(title="지역별 평균 영어 실력 (상위 10개)", xaxis_title="평균 점수", yaxis_title="지역")
+    return fig
+
+@st.cache_resource(ttl=300, max_entries=128)
+def pie_figure(values: list, names: list, title: str) -> go.Figure:
+    """비율 파이차트"""
+    return go.Figure(go.Pie(values=values, labels=names), layout={'title': title})
+
+@st.cache_resource(ttl=300, max_entries=128)
+def age_histogram_figure(counts: list, edges: list) -> go.Figure:
+    """서버에서 계산한 구간별 빈도로 연령 분포 히스토그램 생성"""
+    edges = np.asarray(edges, dtype=float)
+    fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges)))
+    fig.update_layout(title="연령 분포", xaxis_title="연령", yaxis_title="빈도", bargap=0)
+    return fig
+
 def display_hypothesis_result(result: dict, hypothesis_num: int):
     """가설 결과 표시"""
     st.subheader(f"📊 통계 분석 결과")
@@ -122,6 +315,136 @@ def display_hypothesis_result(result: dict, hypothesis_num: int):
     with st.expander("상세 통계 정보"):
         st.json(result['statistics'])
 
+def render_age_tab(filters: tuple, summary: dict, chart_data: dict):
+    """가설 1 탭: 연령별 분석"""
+    st.header("가설 1: 연령대가 낮을수록 점수가 높을 것이다")
+    
+    # API에서 분석 결과 가져오기
+    h1_result = api_request("/analysis/hypothesis1", "POST", filters)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # 연령대별 점수 박스플롯
+        if chart_data['box_stats']['age_group']:
+            fig1 = box_figure(chart_data['box_stats']['age_group'], "연령대별 영어 실력 분포", "연령대", AGE_GROUP_ORDER)
+            st.plotly_chart(fig1, use_container_width=True, config=PLOTLY_CONFIG)
+    
+    with col2:
+        # 연령과 점수의 산점도 (서버에서 LTTB로 축소된 시리즈)
+        df_scatter = api_request("/data/age_vs_score", "POST", filters)
+        fig2 = age_scatter_figure(df_scatter)
+        st.plotly_chart(fig2, use_container_width=True, config=PLOTLY_CONFIG)
+    
+    # 통계 분석 결과 표시
+    display_hypothesis_result(h1_result, 1)
+
+def render_region_tab(filters: tuple, summary: dict, chart_data: dict):
+    """가설 2 탭: 지역별 분석"""
+    st.header("가설 2: 수도권(서울/경기)일수록 점수가 높을 것이다")
+    
+    # API에서 분석 결과 가져오기
+    h2_result = api_request("/analysis/hypothesis2", "POST", filters)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # 수도권 vs 비수도권 박스플롯
+        fig3 = box_figure(chart_data['box_stats']['region'], "수도권 vs 비수도권 영어 실력 비교", "지역")
+        st.plotly_chart(fig3, use_container_width=True, config=PLOTLY_CONFIG)
+    
+    with col2:
+        # 지역별 평균 점수
+        location_stats = chart_data['location_stats']
+        if location_stats.get('mean'):
+            fig4 = location_bar_figure(location_frame(location_stats))
+            st.plotly_chart(fig4, use_container_width=True, config=PLOTLY_CONFIG)
+    
+    # 통계 분석 결과 표시
+    display_hypothesis_result(h2_result, 2)
+
+def render_experience_tab(filters: tuple, summary: dict, chart_data: dict):
+    """가설 3 탭: 영어권 거주 경험"""
+    st.header("가설 3: 영어권 거주 경험이 있을수록 점수가 높을 것이다")
+    
+    # API에서 분석 결과 가져오기
+    h3_result = api_request("/analysis/hypothesis3", "POST", filters)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # 영어권 거주 경험별 박스플롯
+        fig5 = box_figure(chart_data['box_stats']['experience'], "영어권 거주 경험별 영어 실력 비교", "영어권 거주 경험")
+        st.plotly_chart(fig5, use_container_width=True, config=PLOTLY_CONFIG)
+    
+    with col2:
+        # 영어권 거주 경험별 레벨 분포 파이차트
+        exp_ratio = summary['experience_ratio']
+        no_exp_ratio = 1 - exp_ratio
+        
+        fig6 = pie_figure([exp_ratio, no_exp_ratio], ['경험 있음', '경험 없음'], "영어권 거주 경험별 참가자 비율")
+        st.plotly_chart(fig6, use_container_width=True, config=PLOTLY_CONFIG)
+    
+    # 통계 분석 결과 표시
+    display_hypothesis_result(h3_result, 3)
+
+def render_overview_tab(filters: tuple, summary: dict, chart_data: dict):
+    """전체 데이터 개요 탭"""
+    st.header("📊 전체 데이터 개요")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # 영어 레벨 분포
+        level_dist = chart_data['level_distribution']
+        fig7 = pie_figure(
+            list(level_dist.values()),
+            [LEVEL_LEGEND.get(level, level) for level in level_dist],
+            "영어 레벨 분포"
+        )
+        st.plotly_chart(fig7, use_container_width=True, config=PLOTLY_CONFIG)
+    
+    with col2:
+        # 연령 분포
+        age_histogram = chart_data['age_histogram']
+        fig8 = age_histogram_figure(age_histogram['counts'], age_histogram['edges'])
+        st.plotly_chart(fig8, use_container_width=True, config=PLOTLY_CONFIG)
+    
+    # 지역별 상세 통계
+    st.subheader("지역별 상세 통계")
+    
+    location_stats = chart_data['location_stats']
+    if location_stats.get('mean'):
+        location_df = (
+            location_frame(location_stats)[['count', 'mean']]
+            .round({'mean': 3})
+            .rename(columns={'count': '참가자 수', 'mean': '평균 점수'})
+            .rename_axis('지역')
+            .reset_index()
+            .sort_values('평균 점수', ignore_index=True)
+        )
+        st.dataframe(location_df, use_container_width=True)
+    
+    # 주요 발견사항
+    st.subheader("💡 주요 발견사항")
+    st.info("""
+    **모든 가설이 기각되어 일반적인 직관과 반대되는 결과:**
+    - **연령**: 나이가 많을수록 영어 실력이 더 좋음
+    - **지역**: 비수도권이 수도권보다 영어 실력이 더 좋음  
+    - **경험**: 영어권 거주 경험이 없는 사람들의 영어 실력이 더 좋음
+    
+    이러한 결과는 데이터의 특성이나 샘플링 방법에 따른 것일 수 있으며, 
+    추가적인 연구와 분석이 필요합니다.
+    """)
+
+# 탭 라벨 -> (렌더링 함수, 요약/차트 데이터와 함께 미리 병렬 요청할 API)
+TABS = {
+    "📈 가설 1: 연령별 분석": (render_age_tab, ["/analysis/hypothesis1", "/data/age_vs_score"]),
+    "🏙️ 가설 2: 지역별 분석": (render_region_tab, ["/analysis/hypothesis2"]),
+    "🌍 가설 3: 영어권 경험": (render_experience_tab, ["/analysis/hypothesis3"]),
+    "📊 전체 데이터 개요": (render_overview_tab, [])
+}
+
 def main():
     # 타이틀
     st.title("🎯 한국인 영어 실력 데이터 분석")
@@ -135,13 +458,17 @@ def main():
         st.code("cd /Users/juun0.han/projects/kor_eng_da && uv run python api_server.py")
         st.stop()
     
+    # 이후 API 캐시는 서버 데이터 버전이 바뀔 때 무효화
+    st.session_state["data_version"] = health_info.get("data_version")
+    prune_disk_cache(st.session_state["data_version"])
+    
     # 서버 상태 표시
     with st.expander("🖥️ 서버 상태"):
         st.success(f"✅ API 서버 연결됨 - {health_info.get('record_count', 0):,}개 레코드")
         st.caption(f"마지막 확인: {health_info.get('timestamp', 'N/A')}")
     
     # 필터 데이터 가져오기
-    locations, levels = get_filter_data()
+    locations, levels = get_filter_data(st.session_state["data_version"])
     
     # 사이드바 - 필터
     st.sidebar.header("🔍 데이터 필터")
@@ -163,12 +490,13 @@ def main():
     selected_levels = st.sidebar.multiselect("영어 레벨 선택", level_options, default=['전체'])
     
     # 필터 적용
-    filters = create_filter_request(age_range, selected_locations, selected_levels)
+    filters = freeze_filters(create_filter_request(age_range, selected_locations, selected_levels))
     
-    # 데이터 요약 가져오기
+    # 데이터 요약 가져오기 (선택된 탭의 분석 API는 동시에 미리 요청)
+    active_tab = st.session_state.get("active_tab", next(iter(TABS)))
+    render_tab, tab_endpoints = TABS[active_tab]
     try:
-        summary = api_request("/data/summary", "POST", filters)
-        chart_data = api_request("/data/chart_data", "POST", filters)
+        summary, chart_data, tab_prefetch = fetch_dashboard_data(filters, tab_endpoints)
     except Exception as e:
         st.error(f"데이터를 가져오는데 실패했습니다: {e}")
         st.stop()
@@ -188,222 +516,17 @@ def main():
     with col4:
         st.metric("영어권 거주 경험", f"{summary['experience_ratio']*100:.1f}%")
     
-    # 탭 생성
-    tab1, tab2, tab3, tab4 = st.tabs(["📈 가설 1: 연령별 분석", "🏙️ 가설 2: 지역별 분석", "🌍 가설 3: 영어권 경험", "📊 전체 데이터 개요"])
-    
-    # 가설 1: 연령별 분석
-    with tab1:
-        st.header("가설 1: 연령대가 낮을수록 점수가 높을 것이다")
-        
-        # API에서 분석 결과 가져오기
-        h1_result = api_request("/analysis/hypothesis1", "POST", filters)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # 연령대별 평균 점수 박스플롯
-            if chart_data.get('age_group_stats'):
-                age_group_data = chart_data['age_group_stats']
-                
-                # 데이터 준비
-                ages = chart_data['age_vs_score']['ages']
-                scores = chart_data['age_vs_score']['scores']
-                levels = chart_data['age_vs_score']['levels']
-                
-                df_plot = pd.DataFrame({
-                    'age': ages,
-                    'score': scores,
-                    'level': levels
-                })
-                
-                # 연령대 그룹 생성
-                def create_age_groups(age):
-                    if age < 25:
-                        return '20대 초반'
-                    elif age < 30:
-                        return '20대 후반'
-                    elif age < 35:
-                        return '30대 초반'
-                    elif age < 40:
-                        return '30대 후반'
-                    else:
-                        return '40대 이상'
-                
-                df_plot['age_group'] = df_plot['age'].apply(create_age_groups)
-                
-                fig1 = px.box(
-                    df_plot, 
-                    x='age_group', 
-                    y='score',
-                    title="연령대별 영어 실력 분포",
-                    labels={'score': '영어 실력 점수', 'age_group': '연령대'}
-                )
-                st.plotly_chart(fig1, use_container_width=True)
-        
-        with col2:
-            # 연령과 점수의 산점도
-            fig2 = px.scatter(
-                df_plot, 
-                x='age', 
-                y='score',
-                color='level',
-                title="연령 vs 영어 실력 상관관계",
-                labels={'score': '영어 실력 점수', 'age': '연령'}
-            )
-            st.plotly_chart(fig2, use_container_width=True)
-        
-        # 통계 분석 결과 표시
-        display_hypothesis_result(h1_result, 1)
-    
-    # 가설 2: 지역별 분석
-    with tab2:
-        st.header("가설 2: 수도권(서울/경기)일수록 점수가 높을 것이다")
-        
-        # API에서 분석 결과 가져오기
-        h2_result = api_request("/analysis/hypothesis2", "POST", filters)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # 수도권 vs 비수도권 박스플롯
-            metro_scores = chart_data['metro_comparison']['metro_scores']
-            non_metro_scores = chart_data['metro_comparison']['non_metro_scores']
-            
-            df_metro = pd.DataFrame({
-                'region': ['수도권'] * len(metro_scores) + ['비수도권'] * len(non_metro_scores),
-                'score': metro_scores + non_metro_scores
-            })
-            
-            fig3 = px.box(
-                df_metro, 
-                x='region', 
-                y='score',
-                title="수도권 vs 비수도권 영어 실력 비교",
-                labels={'score': '영어 실력 점수', 'region': '지역'}
-            )
-            st.plotly_chart(fig3, use_container_width=True)
-        
-        with col2:
-            # 지역별 평균 점수
-            location_stats = chart_data['location_stats']
-            if location_stats.get('mean'):
-                location_means = pd.DataFrame({
-                    'location': list(location_stats['mean'].keys()),
-                    'mean_score': list(location_stats['mean'].values()),
-                    'count': [location_stats['count'].get(loc, 0) for loc in location_stats['mean'].keys()]
-                })
-                
-                # 30명 이상인 지역만 표시
-                location_means = location_means[location_means['count'] >= 30].sort_values('mean_score')
-                
-                fig4 = px.bar(
-                    location_means.head(10),
-                    x='mean_score',
-                    y='location',
-                    orientation='h',
-                    title="지역별 평균 영어 실력 (상위 10개)",
-                    labels={'mean_score': '평균 점수', 'location': '지역'}
-                )
-                st.plotly_chart(fig4, use_container_width=True)
-        
-        # 통계 분석 결과 표시
-        display_hypothesis_result(h2_result, 2)
-    
-    # 가설 3: 영어권 거주 경험
-    with tab3:
-        st.header("가설 3: 영어권 거주 경험이 있을수록 점수가 높을 것이다")
-        
-        # API에서 분석 결과 가져오기
-        h3_result = api_request("/analysis/hypothesis3", "POST", filters)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # 영어권 거주 경험별 박스플롯
-            exp_scores = chart_data['experience_comparison']['exp_scores']
-            no_exp_scores = chart_data['experience_comparison']['no_exp_scores']
-            
-            df_exp = pd.DataFrame({
-                'experience': ['경험 있음'] * len(exp_scores) + ['경험 없음'] * len(no_exp_scores),
-                'score': exp_scores + no_exp_scores
-            })
-            
-            fig5 = px.box(
-                df_exp, 
-                x='experience', 
-                y='score',
-                title="영어권 거주 경험별 영어 실력 비교",
-                labels={'score': '영어 실력 점수', 'experience': '영어권 거주 경험'}
-            )
-            st.plotly_chart(fig5, use_container_width=True)
-        
-        with col2:
-            # 영어권 거주 경험별 레벨 분포 파이차트
-            exp_ratio = summary['experience_ratio']
-            no_exp_ratio = 1 - exp_ratio
-            
-            fig6 = px.pie(
-                values=[exp_ratio, no_exp_ratio],
-                names=['경험 있음', '경험 없음'],
-                title="영어권 거주 경험별 참가자 비율"
-            )
-            st.plotly_chart(fig6, use_container_width=True)
-        
-        # 통계 분석 결과 표시
-        display_hypothesis_result(h3_result, 3)
-    
-    # 전체 데이터 개요
-    with tab4:
-        st.header("📊 전체 데이터 개요")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # 영어 레벨 분포
-            level_dist = chart_data['level_distribution']
-            fig7 = px.pie(
-                values=list(level_dist.values()),
-                names=[f"{level} ({LEVEL_NAMES.get(level, level)})" for level in level_dist.keys()],
-                title="영어 레벨 분포"
-            )
-            st.plotly_chart(fig7, use_container_width=True)
-        
-        with col2:
-            # 연령 분포
-            ages = chart_data['age_vs_score']['ages']
-            fig8 = px.histogram(
-                x=ages,
-                nbins=20,
-                title="연령 분포"
-            )
-            fig8.update_layout(xaxis_title="연령", yaxis_title="빈도")
-            st.plotly_chart(fig8, use_container_width=True)
-        
-        # 지역별 상세 통계
-        st.subheader("지역별 상세 통계")
-        
-        location_stats = chart_data['location_stats']
-        if location_stats.get('mean'):
-            location_df = pd.DataFrame({
-                '지역': list(location_stats['mean'].keys()),
-                '참가자 수': [location_stats['count'].get(loc, 0) for loc in location_stats['mean'].keys()],
-                '평균 점수': [round(score, 3) for score in location_stats['mean'].values()]
-            })
-            
-            location_df = location_df.sort_values('평균 점수').reset_index(drop=True)
-            st.dataframe(location_df, use_container_width=True)
-        
-        # 주요 발견사항
-        st.subheader("💡 주요 발견사항")
-        st.info("""
-        **모든 가설이 기각되어 일반적인 직관과 반대되는 결과:**
-        - **연령**: 나이가 많을수록 영어 실력이 더 좋음
-        - **지역**: 비수도권이 수도권보다 영어 실력이 더 좋음  
-        - **경험**: 영어권 거주 경험이 없는 사람들의 영어 실력이 더 좋음
-        
-        이러한 결과는 데이터의 특성이나 샘플링 방법에 따른 것일 수 있으며, 
-        추가적인 연구와 분석이 필요합니다.
-        """)
+    # 탭 선택 (선택된 탭만 API 호출 및 차트 생성, 선택값은 session_state["active_tab"])
+    st.radio(
+        "분석 선택",
+        list(TABS.keys()),
+        horizontal=True,
+        key="active_tab",
+        label_visibility="collapsed"
+    )
+    # 요약 지표와 탭 선택을 그린 뒤 미리 요청한 탭 API 완료 대기 (탭 내부 호출은 캐시 적중)
+    wait(tab_prefetch)
+    render_tab(filters, summary, chart_data)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
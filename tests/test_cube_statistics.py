@@ -0,0 +1,163 @@
+"""
+집계 큐브 기반 통계 함수가 원시 데이터에 대한 scipy/pandas 결과와 일치하는지 검증
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import chi2_contingency, f_oneway, pearsonr, spearmanr, ttest_ind
+
+import api_server as api
+
+LOCATIONS = ['서울특별시', '경기도', '부산광역시', '대구광역시', '전라남도']
+LEVELS = ['IG', 'TL', 'TM', 'TH', 'NA']
+
+# 필터 없음 / 연령 범위 / 지역+레벨 / 단일 레벨 / 단일 지역
+FILTER_CASES = [
+    {},
+    {'age_min': 25, 'age_max': 35},
+    {'locations': ['서울특별시', '부산광역시'], 'levels': ['IG', 'TM', 'NA']},
+    {'levels': ['TM']},
+    {'locations': ['부산광역시']},
+]
+
+
+def make_documents(n: int, seed: int = 0) -> list:
+    """연령이 높을수록 낮은 레벨이 많아지도록 치우친 합성 원본 문서"""
+    rng = np.random.default_rng(seed)
+    documents = []
+    for i in range(n):
+        age = int(rng.integers(20, 50))
+        skew = (age - 20) / 30
+        probs = np.array([0.2 + 0.4*skew, 0.25, 0.25 - 0.1*skew, 0.15 - 0.1*skew, 0.2 - 0.15*skew])
+        documents.append({
+            'speaker': {
+                'id': f'P{i}',
+                'age': age,
+                'gender': str(rng.choice(['male', 'female'])),
+                'location': str(rng.choice(LOCATIONS)),
+                'level': {'final': str(rng.choice(LEVELS, p=probs / probs.sum()))},
+                'self_grade': 'A',
+                'interview': {'영어권_거주_여부': str(rng.choice(['있음', '없음']))}
+            },
+            'metadata': {'date': '20250801', 'year': '2025'}
+        })
+    return documents
+
+
+@pytest.fixture(scope='module')
+def df() -> pd.DataFrame:
+    return api.preprocess_dataframe(api.extract_analysis_frame(make_documents(3000)))
+
+
+@pytest.fixture(scope='module')
+def cube(df: pd.DataFrame) -> pd.DataFrame:
+    return api.build_cube(df)
+
+
+@pytest.fixture(params=FILTER_CASES, ids=lambda f: ','.join(f) or 'none')
+def filtered(request, df: pd.DataFrame, cube: pd.DataFrame):
+    """같은 필터를 원시 데이터와 큐브에 적용한 (원시 부분집합, 큐브 부분집합)"""
+    key = api.filter_key(api.FilterRequest(**request.param))
+    return df[api.filter_mask(df, key)], cube[api.filter_mask(cube, key)]
+
+
+def scores_of(sub: pd.DataFrame) -> np.ndarray:
+    return sub['english_level_numeric'].to_numpy(dtype=np.float64)
+
+
+def test_build_cube_preserves_counts_and_sums(df: pd.DataFrame, cube: pd.DataFrame):
+    assert cube['count'].sum() == len(df)
+    assert cube['sum'].sum() == pytest.approx(scores_of(df).sum())
+    assert cube['sum_sq'].sum() == pytest.approx((scores_of(df)**2).sum())
+    # english_level이 차원이므로 셀 점수는 레벨 점수와 일치
+    assert (cube['score'] == cube['english_level'].map(api.LEVEL_MAPPING).astype(np.float64)).all()
+
+
+def test_cube_moments_match_raw(filtered):
+    sub, sub_cube = filtered
+    n, mean, var = api.cube_moments(sub_cube)
+    assert n == len(sub)
+    np.testing.assert_allclose([mean, var], [scores_of(sub).mean(), scores_of(sub).var(ddof=1)], atol=1e-12)
+
+
+def test_cube_group_stats_match_groupby(filtered):
+    sub, sub_cube = filtered
+    expected = sub.groupby('age_group', observed=True)['english_level_numeric'].agg(['count', 'mean', 'std']).to_dict()
+    result = api.cube_group_stats(sub_cube, 'age_group')
+    for stat, groups in expected.items():
+        for group, value in groups.items():
+            np.testing.assert_allclose(result[stat][group], value, atol=1e-12, err_msg=f'{stat}/{group}')
+
+
+def test_weighted_pearsonr_matches_scipy(filtered):
+    sub, sub_cube = filtered
+    weights = sub_cube['count'].to_numpy(dtype=np.float64)
+    with warnings.catch_warnings():
+        # 단일 레벨이면 점수가 상수라 scipy와 같이 nan
+        warnings.simplefilter('ignore')
+        result = api.weighted_pearsonr(sub_cube['age'].to_numpy(dtype=np.float64), sub_cube['score'].to_numpy(), weights)
+        expected = pearsonr(sub['age'].to_numpy(dtype=np.float64), scores_of(sub))
+    np.testing.assert_allclose(result, tuple(expected), rtol=1e-9)
+
+
+def test_weighted_rank_spearman_matches_scipy(filtered):
+    sub, sub_cube = filtered
+    weights = sub_cube['count'].to_numpy(dtype=np.float64)
+    age_ranks = api.weighted_rank(sub_cube['age'].to_numpy(dtype=np.float64), weights)
+    score_ranks = api.weighted_rank(sub_cube['score'].to_numpy(), weights)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        result = api.weighted_pearsonr(age_ranks, score_ranks, weights)
+        expected = spearmanr(sub['age'].to_numpy(dtype=np.float64), scores_of(sub))
+    np.testing.assert_allclose(result, tuple(expected), rtol=1e-9)
+
+
+def test_weighted_rank_matches_pandas_rank():
+    values = np.array([3.0, 1.0, 2.0, 5.0])
+    weights = np.array([2.0, 3.0, 1.0, 4.0])
+    expanded = pd.Series(np.repeat(values, weights.astype(int)))
+    expected = expanded.rank(method='average').groupby(expanded).first()
+    np.testing.assert_allclose(api.weighted_rank(values, weights), expected[values].to_numpy())
+
+
+def test_cube_anova_matches_f_oneway(filtered):
+    sub, sub_cube = filtered
+    if sub_cube['age_group'].nunique() < 2:
+        pytest.skip('연령대가 하나뿐이면 API는 ANOVA를 건너뜀')
+    groups = [scores_of(group) for _, group in sub.groupby('age_group', observed=True)]
+    with warnings.catch_warnings():
+        # 단일 레벨이면 집단 내 분산이 0이라 scipy와 같이 nan
+        warnings.simplefilter('ignore')
+        result = api.cube_anova(sub_cube, 'age_group')
+        expected = f_oneway(*groups)
+    if sub['english_level'].nunique() == 1:
+        assert np.isnan(expected).all()
+    np.testing.assert_allclose(result, tuple(expected), rtol=1e-9)
+
+
+@pytest.mark.parametrize('group_col', ['is_metropolitan', 'english_speaking_experience'])
+def test_student_ttest_matches_ttest_ind(filtered, group_col: str):
+    sub, sub_cube = filtered
+    in_group = sub_cube[group_col].to_numpy(dtype=bool)
+    group1, group2 = sub[sub[group_col]], sub[~sub[group_col]]
+    if min(len(group1), len(group2)) < 5:
+        pytest.skip('한 그룹이 5명 미만이면 API는 400 응답')
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        result = api.student_ttest(*api.cube_moments(sub_cube[in_group]), *api.cube_moments(sub_cube[~in_group]))
+        expected = ttest_ind(scores_of(group1), scores_of(group2))
+    np.testing.assert_allclose(result, tuple(expected), rtol=1e-9)
+
+
+@pytest.mark.parametrize('group_col', ['is_metropolitan', 'english_speaking_experience'])
+def test_cube_contingency_matches_crosstab(filtered, group_col: str):
+    sub, sub_cube = filtered
+    table = api.cube_contingency(sub_cube, group_col)
+    expected = pd.crosstab(sub[group_col], sub['english_level'])
+    expected = expected.loc[:, expected.sum() > 0]
+    np.testing.assert_array_equal(table.to_numpy(), expected.to_numpy())
+    np.testing.assert_array_equal(table.index.to_numpy(), expected.index.to_numpy())
+    np.testing.assert_array_equal(table.columns.astype(str), expected.columns.astype(str))
+    np.testing.assert_allclose(chi2_contingency(table)[:2], chi2_contingency(expected)[:2])